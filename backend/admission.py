@@ -0,0 +1,207 @@
+"""
+Admission Control
+Per-lane request-body limits, concurrency limits and load shedding, with each
+lane's work running on its own thread pool
+
+A request waiting in or running on a lane also holds the server thread that
+received it, so the lanes together can occupy ``threads_needed()`` threads of
+a worker; size the server's thread count to at least that.
+"""
+
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Request, copy_current_request_context, current_app, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionError(Exception):
+    """
+    Raised when a lane sheds a request
+    """
+
+    def __init__(self, status, message, retry_after=1):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class Lane:
+    """
+    A traffic class with its own worker threads and bounded queue
+
+    At most ``max_concurrent`` requests execute at once on the lane's pool and
+    at most ``max_queue`` more wait for a slot. Beyond that requests are
+    rejected immediately with 429; a queued request that has not started
+    within ``queue_timeout`` seconds is rejected with 503.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout, max_body_bytes):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_body_bytes = max_body_bytes
+        self.inflight = 0
+        self.running = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.rejected_too_large = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix=f"lane-{name}")
+
+    @classmethod
+    def from_env(cls, name, max_concurrent, max_queue, queue_timeout, max_body_bytes):
+        """
+        Build a lane whose defaults can be overridden by ADMISSION_<NAME>_* variables
+        """
+        prefix = f"ADMISSION_{name.upper()}_"
+        return cls(
+            name,
+            max_concurrent=int(os.environ.get(prefix + 'CONCURRENCY', max_concurrent)),
+            max_queue=int(os.environ.get(prefix + 'QUEUE', max_queue)),
+            queue_timeout=float(os.environ.get(prefix + 'QUEUE_TIMEOUT', queue_timeout)),
+            max_body_bytes=int(os.environ.get(prefix + 'MAX_BODY_BYTES', max_body_bytes))
+        )
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run ``func`` on this lane's pool and wait for its result, or shed the request
+        """
+        with self._lock:
+            if self.inflight >= self.max_concurrent + self.max_queue:
+                self.rejected_full += 1
+                raise AdmissionError(429, f"Too many {self.name} requests in flight, retry later")
+            self.inflight += 1
+            self.admitted += 1
+
+        started = threading.Event()
+
+        def task():
+            started.set()
+            with self._lock:
+                self.running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        try:
+            future = self._executor.submit(task)
+            if not started.wait(self.queue_timeout) and future.cancel():
+                with self._lock:
+                    self.rejected_timeout += 1
+                raise AdmissionError(503, f"Timed out waiting for a {self.name} slot, retry later",
+                                     retry_after=max(1, int(self.queue_timeout)))
+            return future.result()
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'max_body_bytes': self.max_body_bytes,
+                'running': self.running,
+                'queued': self.inflight - self.running,
+                'admitted': self.admitted,
+                'rejected': {
+                    'queue_full': self.rejected_full,
+                    'queue_timeout': self.rejected_timeout,
+                    'body_too_large': self.rejected_too_large
+                }
+            }
+
+
+def _body_too_large(max_body_bytes):
+    """
+    Whether the request body exceeds ``max_body_bytes``
+
+    A body sent without Content-Length is buffered (up to the limit, see
+    LaneRequest) so the view can still read it; Werkzeug truncates such a
+    body at the limit rather than failing, so a further read tells whether
+    it was cut off.
+    """
+    if request.content_length is not None:
+        return request.content_length > max_body_bytes
+    request.get_data(cache=True)
+    try:
+        request.stream.read(1)
+    except RequestEntityTooLarge:
+        return True
+    return False
+
+
+class AdmissionController:
+    """
+    Routes views into lanes; ``@admission.admit('batch')`` wraps a Flask view
+    """
+
+    def __init__(self, lanes):
+        self.lanes = {lane.name: lane for lane in lanes}
+
+    def threads_needed(self):
+        """
+        Server threads the lanes can hold at once (running plus queued requests)
+        """
+        return sum(lane.max_concurrent + lane.max_queue for lane in self.lanes.values())
+
+    def admit(self, lane_name):
+        lane = self.lanes[lane_name]
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if _body_too_large(lane.max_body_bytes):
+                    with lane._lock:
+                        lane.rejected_too_large += 1
+                    return jsonify({
+                        'error': f"Request body too large for {lane_name} endpoint "
+                                 f"(limit {lane.max_body_bytes} bytes)"
+                    }), 413
+
+                try:
+                    return lane.run(copy_current_request_context(view), *args, **kwargs)
+                except AdmissionError as e:
+                    logger.warning(f"Shedding {request.path}: {e.message}")
+                    response = jsonify({'error': e.message})
+                    response.status_code = e.status
+                    response.headers['Retry-After'] = str(e.retry_after)
+                    return response
+
+            wrapper.admission_lane = lane
+            return wrapper
+
+        return decorator
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+class LaneRequest(Request):
+    """
+    Request whose body-size limit is that of the lane admitting its endpoint
+
+    Applies the lane limit to bodies without a Content-Length header (chunked
+    uploads), which the admission wrapper cannot check up front. Endpoints
+    outside any lane keep the app's MAX_CONTENT_LENGTH.
+    """
+
+    @property
+    def max_content_length(self):
+        view = current_app.view_functions.get(self.endpoint) if self.endpoint else None
+        lane = getattr(view, 'admission_lane', None)
+        if lane is not None:
+            return lane.max_body_bytes
+        return super().max_content_length
@@ -1,11 +1,20 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
-import joblib
+import io
 import os
 import logging
+import math
+import threading
 from datetime import datetime
+from admission import AdmissionController, Lane, LaneRequest
+from jobs import JobStore, JobWorkerPool
+from offload import ProcessOffload
+from registry import ModelRegistry
+from responses import StaticResponseCache, dumps, json_response, loads
+
+# pandas, joblib and the model libraries (sklearn/xgboost, pulled in by
+# unpickling) are imported lazily so the worker can bind and answer liveness
+# checks before the heavy inference stack is loaded.
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,28 +23,226 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# Interactive and batch traffic run on separate lanes (thread pools) with their own
+# concurrency, queue and body-size limits, so a large batch upload cannot starve
+# single predictions. Defaults add up to 12 of the 16 threads of a gunicorn
+# gthread worker (see gunicorn.conf.py): 6 interactive, 2 batch and 4 jobs, so
+# the non-interactive lanes can never take the interactive lane's threads and 4
+# are left for endpoints outside the lanes. They can be overridden with
+# ADMISSION_<LANE>_* variables.
+admission = AdmissionController([
+    Lane.from_env('interactive', max_concurrent=4, max_queue=2, queue_timeout=2.0,
+                  max_body_bytes=256 * 1024),
+    Lane.from_env('batch', max_concurrent=1, max_queue=1, queue_timeout=1.0,
+                  max_body_bytes=16 * 1024 * 1024),
+    # Job submission streams the body to disk here; parsing it and writing the
+    # records happen on the offload process, scoring on the job workers
+    Lane.from_env('jobs', max_concurrent=2, max_queue=2, queue_timeout=2.0,
+                  max_body_bytes=64 * 1024 * 1024)
+])
+# Endpoints in a lane get the lane's body limit (LaneRequest); everything else
+# gets the interactive one
+app.request_class = LaneRequest
+app.config['MAX_CONTENT_LENGTH'] = admission.lanes['interactive'].max_body_bytes
+
 # Load models and artifacts
 MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models')
 
-try:
-    model = joblib.load(os.path.join(MODEL_DIR, 'churn_model.pkl'))
-    scaler = joblib.load(os.path.join(MODEL_DIR, 'scaler.pkl'))
-    label_encoders = joblib.load(os.path.join(MODEL_DIR, 'label_encoders.pkl'))
-    feature_names = joblib.load(os.path.join(MODEL_DIR, 'feature_names.pkl'))
-    metadata = joblib.load(os.path.join(MODEL_DIR, 'model_metadata.pkl'))
-    logger.info("All models and artifacts loaded successfully")
-except Exception as e:
-    logger.error(f"Error loading models: {str(e)}")
-    model = scaler = label_encoders = feature_names = metadata = None
+# Load artifacts in a background thread at import unless PRELOAD_MODEL=0
+PRELOAD_MODEL = os.environ.get('PRELOAD_MODEL', '1') != '0'
 
+# Challenger models shadow-scored alongside the champion (see registry.py)
+CHALLENGER_DIR = os.environ.get('CHALLENGER_DIR', os.path.join(MODEL_DIR, 'challengers'))
+SHADOW_ENABLED = os.environ.get('SHADOW_ENABLED', '1') != '0'
 
-def preprocess_input(data):
+registry = ModelRegistry(
+    champion_name='churn_model',
+    challenger_dir=CHALLENGER_DIR,
+    workers=int(os.environ.get('SHADOW_WORKERS', 1)),
+    max_pending_rows=int(os.environ.get('SHADOW_MAX_PENDING_ROWS', 100000))
+)
+
+
+def shadow_active():
     """
-    Preprocess input data for prediction
+    Whether to hand scored batches to the registry: only with challengers to compare
+    """
+    return SHADOW_ENABLED and registry.has_challengers()
+
+ARTIFACT_FILES = ['churn_model.pkl', 'scaler.pkl', 'label_encoders.pkl',
+                  'feature_names.pkl', 'model_metadata.pkl']
+
+# Bodies of responses that only change with the model, serialized once per model version
+static_responses = StaticResponseCache()
+
+# Asynchronous batch scoring jobs (see jobs.py)
+JOBS_DIR = os.environ.get('JOBS_DIR', os.path.join(os.path.dirname(__file__), 'jobs'))
+JOBS_ENABLED = os.environ.get('JOBS_ENABLED', '1') != '0'
+JOB_CHUNK_SIZE = int(os.environ.get('JOB_CHUNK_SIZE', 1000))
+# Upper bound on a client-requested chunk_size; one chunk is held in memory and
+# scored between heartbeats, so it must stay small relative to the upload limit
+JOB_MAX_CHUNK_SIZE = int(os.environ.get('JOB_MAX_CHUNK_SIZE', max(JOB_CHUNK_SIZE, 5000)))
+
+# Batch, what-if and job scoring run in separate, reniced processes (see offload.py)
+# so they never hold the GIL of the worker serving single predictions.
+# BATCH_PROCESSES=0 scores them on the worker's own threads instead.
+offload = ProcessOffload(
+    __name__,
+    processes=int(os.environ.get('BATCH_PROCESSES', 1)),
+    nice=int(os.environ.get('BATCH_NICE', 10)),
+    # Offload processes enqueue jobs but never run them
+    env={'PRELOAD_MODEL': '0', 'JOB_WORKERS': '0', 'SHADOW_ENABLED': '0', 'BATCH_PROCESSES': '0'}
+)
+
+model = scaler = label_encoders = feature_names = metadata = None
+model_version = model_trained_at = None
+_artifacts_loaded = False
+_artifacts_lock = threading.Lock()
+_loader_thread = None
+
+
+def load_artifacts():
+    """
+    Load the model and preprocessing artifacts on first use
+
+    Safe to call from any thread; returns True if the model is available.
     """
+    global model, scaler, label_encoders, feature_names, metadata, _artifacts_loaded
+    global model_version, model_trained_at
+    
+    if _artifacts_loaded:
+        return model is not None
+    
+    with _artifacts_lock:
+        if not _artifacts_loaded:
+            import joblib
+            
+            try:
+                model = joblib.load(os.path.join(MODEL_DIR, 'churn_model.pkl'))
+                scaler = joblib.load(os.path.join(MODEL_DIR, 'scaler.pkl'))
+                label_encoders = joblib.load(os.path.join(MODEL_DIR, 'label_encoders.pkl'))
+                feature_names = joblib.load(os.path.join(MODEL_DIR, 'feature_names.pkl'))
+                metadata = joblib.load(os.path.join(MODEL_DIR, 'model_metadata.pkl'))
+                model_version = artifacts_digest()
+                model_trained_at = datetime.fromtimestamp(
+                    os.path.getmtime(os.path.join(MODEL_DIR, 'churn_model.pkl'))).isoformat()
+                logger.info(f"All models and artifacts loaded successfully (version {model_version[:12]})")
+            except Exception as e:
+                logger.error(f"Error loading models: {str(e)}")
+                model = scaler = label_encoders = feature_names = metadata = None
+            
+            _artifacts_loaded = True
+    
+    return model is not None
+
+
+def artifacts_digest():
+    """
+    Content hash of the model artifacts, used as the model version
+    """
+    import hashlib
+    
+    digest = hashlib.sha1()
+    for name in ARTIFACT_FILES:
+        with open(os.path.join(MODEL_DIR, name), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reset_after_fork():
+    # A fork (e.g. gunicorn --preload) can happen while the loader thread
+    # holds the lock; the child gets a fresh one and loads for itself.
+    # Background threads do not survive a fork either, so restart job workers.
+    global _artifacts_lock
+    _artifacts_lock = threading.Lock()
+    offload.reset_after_fork()
+    if JOBS_ENABLED:
+        job_workers.restart_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def start_loading():
+    """
+    Load the artifacts on a background thread unless they are loaded or loading
+    """
+    global _loader_thread
+    if _artifacts_loaded or (_loader_thread is not None and _loader_thread.is_alive()):
+        return
+    _loader_thread = threading.Thread(target=load_artifacts, name='load-artifacts', daemon=True)
+    _loader_thread.start()
+
+
+if PRELOAD_MODEL:
+    start_loading()
+
+
+def score_job_chunk(records, offset):
+    """
+    Score one chunk of a batch job with the vectorized batch path, off-process
+    """
+    results, shadow = offload.run(job_chunk_task, records, offset, shadow_active())
+    submit_shadow(shadow)
+    return results
+
+
+def job_chunk_task(records, offset, collect_shadow):
+    if not load_artifacts():
+        raise RuntimeError('Model not loaded')
+    shadow = [] if collect_shadow else None
+    return score_records(records, offset=offset, shadow=shadow), shadow or []
+
+
+job_store = job_workers = None
+if JOBS_ENABLED:
+    job_store = JobStore(JOBS_DIR, stale_after=float(os.environ.get('JOB_STALE_SECONDS', 60)))
+    job_workers = JobWorkerPool(job_store, score_job_chunk, workers=int(os.environ.get('JOB_WORKERS', 1)))
+
+
+# Field overrides scored by the what-if endpoint, keyed by intervention name
+DEFAULT_INTERVENTIONS = {
+    'one_year_contract': {'Contract': 'One year'},
+    'two_year_contract': {'Contract': 'Two year'},
+    'online_security': {'OnlineSecurity': 'Yes'},
+    'online_backup': {'OnlineBackup': 'Yes'},
+    'device_protection': {'DeviceProtection': 'Yes'},
+    'tech_support': {'TechSupport': 'Yes'},
+    'automatic_payment': {'PaymentMethod': 'Credit card (automatic)'},
+    'paperless_billing': {'PaperlessBilling': 'Yes'}
+}
+
+# Add-ons that cannot be offered to customers without internet service
+INTERNET_ADDONS = ['OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+                   'TechSupport', 'StreamingTV', 'StreamingMovies']
+
+# Contract terms from shortest to longest; only a longer term is a retention offer
+CONTRACT_TERMS = ['Month-to-month', 'One year', 'Two year']
+
+# Raw input fields a customer record must provide; engineered features are derived from these
+REQUIRED_FEATURES = {
+    'categorical': [
+        'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines',
+        'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+        'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract',
+        'PaperlessBilling', 'PaymentMethod'
+    ],
+    'numerical': [
+        'SeniorCitizen', 'tenure', 'MonthlyCharges', 'TotalCharges'
+    ]
+}
+
+
+def preprocess_records(records):
+    """
+    Preprocess a list of customer records into a feature matrix in one pass
+    """
+    import pandas as pd
+    
     try:
         # Create DataFrame
-        df = pd.DataFrame([data])
+        df = pd.DataFrame(records)
         
         # Feature engineering - same as training
         df['AvgMonthlyCharges'] = df['TotalCharges'] / (df['tenure'] + 1)
@@ -79,6 +286,13 @@ def preprocess_input(data):
         raise
 
 
+def preprocess_input(data):
+    """
+    Preprocess input data for prediction
+    """
+    return preprocess_records([data])
+
+
 @app.route('/')
 def home():
     """
@@ -96,24 +310,37 @@ def home():
 def health_check():
     """
     Detailed health check
+
+    Never waits for the model: while it is still loading this reports
+    "loading" with model_loaded false, so it can serve as a readiness probe.
     """
-    model_status = model is not None
+    if _artifacts_loaded:
+        model_status = model is not None
+        status = 'healthy' if model_status else 'unhealthy'
+    else:
+        # Also covers PRELOAD_MODEL=0 and forked workers with no loader running
+        start_loading()
+        model_status = False
+        status = 'loading'
     return jsonify({
-        'status': 'healthy' if model_status else 'unhealthy',
+        'status': status,
         'model_loaded': model_status,
         'scaler_loaded': scaler is not None,
         'encoders_loaded': label_encoders is not None,
+        'admission': admission.stats(),
+        'offload': offload.stats(),
         'timestamp': datetime.now().isoformat()
     })
 
 
 @app.route('/api/predict', methods=['POST'])
+@admission.admit('interactive')
 def predict():
     """
     Single prediction endpoint
     """
     try:
-        if model is None:
+        if not load_artifacts():
             return jsonify({'error': 'Model not loaded'}), 500
         
         # Get input data
@@ -129,6 +356,9 @@ def predict():
         prediction = model.predict(processed_data)[0]
         probability = model.predict_proba(processed_data)[0]
         
+        if shadow_active():
+            registry.submit(processed_data, probability[1:])
+        
         # Prepare response
         result = {
             'churn': bool(prediction),
@@ -138,7 +368,7 @@ def predict():
             'timestamp': datetime.now().isoformat()
         }
         
-        return jsonify(result)
+        return json_response(result)
     
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
@@ -146,159 +376,405 @@ def predict():
 
 
 @app.route('/api/predict/batch', methods=['POST'])
+@admission.admit('batch')
 def batch_predict():
     """
     Batch prediction endpoint
     """
     try:
-        if model is None:
-            return jsonify({'error': 'Model not loaded'}), 500
-        
-        # Get input data
-        data_list = request.json
-        
-        if not isinstance(data_list, list):
-            return jsonify({'error': 'Input must be a list of records'}), 400
-        
+        # The raw body goes to the offload process, which parses, scores and serializes it
+        return offloaded_response(batch_predict_task, request.get_data(), shadow_active())
+    
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+def offloaded_response(task, *args):
+    """
+    Run ``task`` on the batch offload and turn its (status, body, shadow) into a Response
+    """
+    status, body, shadow = offload.run(task, *args)
+    submit_shadow(shadow)
+    return Response(body, status=status, mimetype='application/json')
+
+
+def submit_shadow(shadow):
+    """
+    Hand (features, champion probabilities) batches scored off-process to the registry
+    """
+    for features, probabilities in shadow:
+        registry.submit(features, probabilities)
+
+
+def batch_predict_task(body, collect_shadow):
+    """
+    Parse and score a /api/predict/batch body; returns (status, JSON bytes, shadow batches)
+    """
+    if not load_artifacts():
+        return 500, dumps({'error': 'Model not loaded'}), []
+    
+    try:
+        data_list = loads(body)
+    except ValueError:
+        return 400, dumps({'error': 'Request body must be valid JSON'}), []
+    
+    if not isinstance(data_list, list):
+        return 400, dumps({'error': 'Input must be a list of records'}), []
+    
+    shadow = [] if collect_shadow else None
+    results = score_records(data_list, shadow=shadow)
+    
+    return 200, dumps({
+        'results': results,
+        'total': len(results),
+        'timestamp': datetime.now().isoformat()
+    }), shadow or []
+
+
+def score_records(data_list, offset=0, shadow=None):
+    """
+    Score a list of customer records with one vectorized model call
+
+    If the batch cannot be preprocessed as a whole (e.g. one malformed record),
+    records are scored individually so each bad record gets its own error.
+    Shadow-scoring input is appended to ``shadow`` when given (so an offload
+    process can return it), otherwise submitted to the registry directly.
+    """
+    try:
+        processed_data = preprocess_records(data_list)
+        probabilities = model.predict_proba(processed_data)
+    except Exception:
+        if len(data_list) == 1:
+            raise
         results = []
-        
         for idx, data in enumerate(data_list):
             try:
-                # Preprocess
-                processed_data = preprocess_input(data)
-                
-                # Predict
-                prediction = model.predict(processed_data)[0]
-                probability = model.predict_proba(processed_data)[0]
-                
-                result = {
-                    'index': idx,
-                    'churn': bool(prediction),
-                    'churn_probability': float(probability[1]),
-                    'confidence': float(max(probability)),
-                    'risk_level': get_risk_level(probability[1])
-                }
-                
-                results.append(result)
-            
+                results.extend(score_records([data], offset=offset + idx, shadow=shadow))
             except Exception as e:
                 results.append({
-                    'index': idx,
+                    'index': offset + idx,
                     'error': str(e)
                 })
-        
-        return jsonify({
-            'results': results,
-            'total': len(results),
-            'timestamp': datetime.now().isoformat()
+        return results
+    
+    if shadow is not None:
+        shadow.append((processed_data, probabilities[:, 1]))
+    elif shadow_active():
+        registry.submit(processed_data, probabilities[:, 1])
+    
+    results = []
+    for idx, probability in enumerate(probabilities):
+        results.append({
+            'index': offset + idx,
+            'churn': bool(probability[1] > 0.5),
+            'churn_probability': float(probability[1]),
+            'confidence': float(max(probability)),
+            'risk_level': get_risk_level(probability[1])
         })
     
+    return results
+
+
+@app.route('/api/jobs', methods=['POST'])
+@admission.admit('jobs')
+def submit_job():
+    """
+    Submit a batch scoring job; returns 202 with the job id to poll
+    """
+    try:
+        if not JOBS_ENABLED:
+            return jsonify({'error': 'Batch jobs are disabled'}), 503
+        
+        # Only copy the raw body to disk on this worker; bodies sent without
+        # Content-Length were already buffered by the admission check
+        body = io.BytesIO(request.get_data()) if request.content_length is None else request.stream
+        upload_path = job_store.spool(body)
+        try:
+            status, payload = offload.run(submit_job_task, upload_path)
+        finally:
+            os.remove(upload_path)
+        
+        response = json_response(payload, status=status)
+        if status == 202:
+            response.headers['Location'] = payload['links']['status']
+        return response
+    
     except Exception as e:
-        logger.error(f"Batch prediction error: {str(e)}")
+        logger.error(f"Job submission error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 
+def submit_job_task(upload_path):
+    """
+    Parse a spooled /api/jobs body and enqueue it; returns (status, payload)
+    """
+    with open(upload_path, 'rb') as f:
+        try:
+            data = loads(f.read())
+        except ValueError:
+            return 400, {'error': 'Request body must be valid JSON'}
+    
+    records = data.get('records') if isinstance(data, dict) else data
+    chunk_size = data.get('chunk_size', JOB_CHUNK_SIZE) if isinstance(data, dict) else JOB_CHUNK_SIZE
+    
+    if not isinstance(records, list) or not records:
+        return 400, {'error': 'Input must be a non-empty list of records'}
+    
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+        return 400, {'error': 'chunk_size must be a positive integer'}
+    
+    if chunk_size > JOB_MAX_CHUNK_SIZE:
+        return 400, {'error': f'chunk_size must be at most {JOB_MAX_CHUNK_SIZE}'}
+    
+    return 202, job_view(job_store.submit(records, chunk_size))
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Status and progress of a batch scoring job
+    """
+    if not JOBS_ENABLED:
+        return jsonify({'error': 'Batch jobs are disabled'}), 503
+    
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return json_response(job_view(job))
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """
+    Stream the results of a completed job as JSON (default) or CSV (?format=csv)
+    """
+    if not JOBS_ENABLED:
+        return jsonify({'error': 'Batch jobs are disabled'}), 503
+    
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['status'] != 'completed':
+        return jsonify({'error': f"Job is {job['status']}", 'job': job_view(job)}), 409
+    
+    if request.args.get('format') == 'csv':
+        return Response(stream_job_csv(job_id), mimetype='text/csv', headers={
+            'Content-Disposition': f"attachment; filename=churn_predictions_{job_id}.csv"
+        })
+    
+    return Response(stream_job_json(job), mimetype='application/json')
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    """
+    Delete a finished job and its files
+    """
+    if not JOBS_ENABLED:
+        return jsonify({'error': 'Batch jobs are disabled'}), 503
+    
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['status'] in ('queued', 'running'):
+        return jsonify({'error': f"Job is {job['status']}"}), 409
+    
+    job_store.delete(job_id)
+    return '', 204
+
+
+def job_view(job):
+    """
+    Public representation of a job row
+    """
+    def iso(ts):
+        return datetime.fromtimestamp(ts).isoformat() if ts else None
+    
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'total': job['total'],
+        'processed': job['processed'],
+        'progress': job['processed'] / job['total'] if job['total'] else 1.0,
+        'error': job['error'],
+        'created_at': iso(job['created_at']),
+        'started_at': iso(job['started_at']),
+        'finished_at': iso(job['finished_at']),
+        'links': {
+            'status': f"/api/jobs/{job['id']}",
+            'results': f"/api/jobs/{job['id']}/results"
+        }
+    }
+
+
+def stream_job_json(job):
+    """
+    Yield a batch-endpoint-shaped JSON document one result at a time
+    """
+    yield f'{{"job_id":"{job["id"]}","total":{job["total"]},"results":['.encode('utf-8')
+    for i, result in enumerate(job_store.iter_results(job['id'])):
+        yield (b',' if i else b'') + dumps(result)
+    yield b']}'
+
+
+def stream_job_csv(job_id):
+    """
+    Yield job results as CSV rows
+    """
+    import csv
+    import io
+    
+    columns = ['index', 'churn', 'churn_probability', 'confidence', 'risk_level', 'error']
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    for result in job_store.iter_results(job_id):
+        writer.writerow(result)
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
 @app.route('/api/model/info', methods=['GET'])
 def model_info():
     """
     Get model information and metrics
     """
     try:
-        if metadata is None:
+        if not load_artifacts():
             return jsonify({'error': 'Model metadata not loaded'}), 500
         
-        info = {
-            'model_name': metadata.get('model_name', 'Unknown'),
-            'metrics': {
-                'accuracy': float(metadata.get('accuracy', 0)),
-                'precision': float(metadata.get('precision', 0)),
-                'recall': float(metadata.get('recall', 0)),
-                'f1_score': float(metadata.get('f1_score', 0)),
-                'roc_auc': float(metadata.get('roc_auc', 0))
-            },
-            'features': {
-                'total': len(feature_names) if feature_names else 0,
-                'categorical': len(metadata.get('categorical_columns', [])),
-                'numerical': len(metadata.get('numerical_columns', []))
-            },
-            'hyperparameters': metadata.get('best_params', {}),
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return jsonify(info)
+        return static_responses.respond(request, 'model_info', model_version, build_model_info)
     
     except Exception as e:
         logger.error(f"Model info error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 
+def build_model_info():
+    """
+    Model information payload; only changes when the model does
+    """
+    return {
+        'model_name': metadata.get('model_name', 'Unknown'),
+        'model_version': model_version,
+        'metrics': {
+            'accuracy': float(metadata.get('accuracy', 0)),
+            'precision': float(metadata.get('precision', 0)),
+            'recall': float(metadata.get('recall', 0)),
+            'f1_score': float(metadata.get('f1_score', 0)),
+            'roc_auc': float(metadata.get('roc_auc', 0))
+        },
+        'features': {
+            'total': len(feature_names) if feature_names else 0,
+            'categorical': len(metadata.get('categorical_columns', [])),
+            'numerical': len(metadata.get('numerical_columns', []))
+        },
+        'hyperparameters': metadata.get('best_params', {}),
+        # When the model artifact was written, so the body is stable per version
+        'timestamp': model_trained_at
+    }
+
+
+@app.route('/api/models', methods=['GET'])
+def models_summary():
+    """
+    Champion model plus shadow-scoring statistics for each challenger
+    """
+    try:
+        summary = registry.summary()
+        summary['champion_model_name'] = metadata.get('model_name', 'Unknown') if load_artifacts() else None
+        summary['shadow_enabled'] = SHADOW_ENABLED
+        return jsonify(summary)
+    
+    except Exception as e:
+        logger.error(f"Models summary error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/features', methods=['GET'])
 def get_features():
     """
     Get list of required features for prediction
     """
     try:
-        required_features = {
-            'categorical': [
-                'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines',
-                'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
-                'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract',
-                'PaperlessBilling', 'PaymentMethod'
-            ],
-            'numerical': [
-                'SeniorCitizen', 'tenure', 'MonthlyCharges', 'TotalCharges'
-            ]
-        }
-        
-        feature_options = {
-            'gender': ['Male', 'Female'],
-            'Partner': ['Yes', 'No'],
-            'Dependents': ['Yes', 'No'],
-            'PhoneService': ['Yes', 'No'],
-            'MultipleLines': ['Yes', 'No', 'No phone service'],
-            'InternetService': ['DSL', 'Fiber optic', 'No'],
-            'OnlineSecurity': ['Yes', 'No', 'No internet service'],
-            'OnlineBackup': ['Yes', 'No', 'No internet service'],
-            'DeviceProtection': ['Yes', 'No', 'No internet service'],
-            'TechSupport': ['Yes', 'No', 'No internet service'],
-            'StreamingTV': ['Yes', 'No', 'No internet service'],
-            'StreamingMovies': ['Yes', 'No', 'No internet service'],
-            'Contract': ['Month-to-month', 'One year', 'Two year'],
-            'PaperlessBilling': ['Yes', 'No'],
-            'PaymentMethod': ['Electronic check', 'Mailed check', 
-                            'Bank transfer (automatic)', 'Credit card (automatic)'],
-            'SeniorCitizen': [0, 1]
-        }
-        
-        return jsonify({
-            'required_features': required_features,
-            'feature_options': feature_options,
-            'total_features': len(required_features['categorical']) + len(required_features['numerical'])
-        })
+        return static_responses.respond(request, 'features', model_version, build_features)
     
     except Exception as e:
         logger.error(f"Features error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 
+def build_features():
+    """
+    Required features and their allowed values
+    """
+    required_features = REQUIRED_FEATURES
+    
+    feature_options = {
+        'gender': ['Male', 'Female'],
+        'Partner': ['Yes', 'No'],
+        'Dependents': ['Yes', 'No'],
+        'PhoneService': ['Yes', 'No'],
+        'MultipleLines': ['Yes', 'No', 'No phone service'],
+        'InternetService': ['DSL', 'Fiber optic', 'No'],
+        'OnlineSecurity': ['Yes', 'No', 'No internet service'],
+        'OnlineBackup': ['Yes', 'No', 'No internet service'],
+        'DeviceProtection': ['Yes', 'No', 'No internet service'],
+        'TechSupport': ['Yes', 'No', 'No internet service'],
+        'StreamingTV': ['Yes', 'No', 'No internet service'],
+        'StreamingMovies': ['Yes', 'No', 'No internet service'],
+        'Contract': ['Month-to-month', 'One year', 'Two year'],
+        'PaperlessBilling': ['Yes', 'No'],
+        'PaymentMethod': ['Electronic check', 'Mailed check', 
+                        'Bank transfer (automatic)', 'Credit card (automatic)'],
+        'SeniorCitizen': [0, 1]
+    }
+    
+    return {
+        'required_features': required_features,
+        'feature_options': feature_options,
+        'total_features': len(required_features['categorical']) + len(required_features['numerical'])
+    }
+
+
 @app.route('/api/recommendations', methods=['POST'])
+@admission.admit('interactive')
 def get_recommendations():
     """
     Get personalized recommendations to reduce churn risk
     """
     try:
+        if not load_artifacts():
+            return jsonify({'error': 'Model not loaded'}), 500
+        
         data = request.json
         
         if not data:
             return jsonify({'error': 'No input data provided'}), 400
         
-        # Preprocess and predict
-        processed_data = preprocess_input(data)
-        probability = model.predict_proba(processed_data)[0][1]
+        # Score the customer and every applicable intervention in one model call
+        scored = score_whatif([data], DEFAULT_INTERVENTIONS)[0]
+        probability = scored['churn_probability']
+        deltas = {item['name']: item['delta'] for item in scored['interventions']}
         
         recommendations = generate_recommendations(data, probability)
+        for rec in recommendations:
+            rec['modelled_delta'] = deltas.get(rec['intervention'])
         
-        return jsonify({
+        # Within a priority, list the interventions the model expects to help most first
+        recommendations.sort(key=lambda x: (
+            {'High': 0, 'Medium': 1, 'Low': 2}[x['priority']],
+            x['modelled_delta'] if x['modelled_delta'] is not None else float('inf')
+        ))
+        
+        return json_response({
             'churn_probability': float(probability),
             'risk_level': get_risk_level(probability),
             'recommendations': recommendations,
@@ -310,6 +786,170 @@ def get_recommendations():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/whatif', methods=['POST'])
+@admission.admit('batch')
+def whatif():
+    """
+    Score field-override interventions for one or more customers
+
+    Accepts {"customer": {...}} or {"customers": [...]}, plus an optional
+    "interventions" mapping of name -> field overrides (defaults to
+    DEFAULT_INTERVENTIONS). All variants are scored in a single model call.
+    """
+    try:
+        return offloaded_response(whatif_task, request.get_data())
+    
+    except Exception as e:
+        logger.error(f"What-if error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+def whatif_task(body):
+    """
+    Parse and score a /api/whatif body; returns (status, JSON bytes, shadow batches)
+    """
+    if not load_artifacts():
+        return 500, dumps({'error': 'Model not loaded'}), []
+    
+    try:
+        data = loads(body)
+    except ValueError:
+        return 400, dumps({'error': 'Request body must be valid JSON'}), []
+    
+    if not data or not isinstance(data, dict):
+        return 400, dumps({'error': 'No input data provided'}), []
+    
+    customers = data.get('customers')
+    if customers is None and 'customer' in data:
+        customers = [data['customer']]
+    
+    if not isinstance(customers, list) or not customers:
+        return 400, dumps({'error': 'Provide a "customer" object or a non-empty "customers" list'}), []
+    
+    for idx, customer in enumerate(customers):
+        try:
+            validate_customer(customer)
+        except ValueError as e:
+            return 400, dumps({'error': f"customers[{idx}]: {str(e)}"}), []
+    
+    interventions = data.get('interventions', DEFAULT_INTERVENTIONS)
+    try:
+        validate_interventions(interventions)
+    except ValueError as e:
+        return 400, dumps({'error': str(e)}), []
+    
+    results = score_whatif(customers, interventions)
+    
+    return 200, dumps({
+        'results': results,
+        'total': len(results),
+        'timestamp': datetime.now().isoformat()
+    }), []
+
+
+def validate_field(field, value):
+    """
+    Check one raw input field; raises ValueError for derived, unknown or invalid fields
+    """
+    if field in REQUIRED_FEATURES['categorical']:
+        if str(value) not in label_encoders[field].classes_:
+            raise ValueError(f"invalid value {value!r} for {field}")
+    elif field in REQUIRED_FEATURES['numerical']:
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+            raise ValueError(f"{field} must be a number, got {value!r}")
+    else:
+        raise ValueError(f"unknown input field {field}")
+
+
+def validate_customer(customer):
+    """
+    Check a customer record has every raw input field with a value the model accepts
+    """
+    if not isinstance(customer, dict):
+        raise ValueError('must be an object of customer fields')
+    
+    required = REQUIRED_FEATURES['categorical'] + REQUIRED_FEATURES['numerical']
+    missing = [field for field in required if field not in customer]
+    if missing:
+        raise ValueError(f"missing fields {', '.join(missing)}")
+    for field in required:
+        validate_field(field, customer[field])
+
+
+def validate_interventions(interventions):
+    """
+    Check intervention overrides name raw input fields with values the model accepts
+
+    Engineered features (e.g. AvgMonthlyCharges) are rejected: preprocessing
+    recomputes them from the raw fields, so overriding them would do nothing.
+    """
+    if not isinstance(interventions, dict) or not interventions:
+        raise ValueError('"interventions" must be a non-empty mapping of name to field overrides')
+    
+    for name, overrides in interventions.items():
+        if not isinstance(overrides, dict) or not overrides:
+            raise ValueError(f"Intervention '{name}' must be a non-empty mapping of field overrides")
+        for field, value in overrides.items():
+            try:
+                validate_field(field, value)
+            except ValueError as e:
+                raise ValueError(f"Intervention '{name}': {str(e)}")
+
+
+def intervention_applies(customer, overrides):
+    """
+    An intervention applies if it changes something the customer could actually take up
+    """
+    if all(customer.get(field) == value for field, value in overrides.items()):
+        return False
+    if overrides.get('Contract') in CONTRACT_TERMS and customer.get('Contract') in CONTRACT_TERMS:
+        if CONTRACT_TERMS.index(overrides['Contract']) <= CONTRACT_TERMS.index(customer['Contract']):
+            return False
+    if customer.get('InternetService') == 'No':
+        return not any(field in INTERNET_ADDONS for field in overrides)
+    return True
+
+
+def score_whatif(customers, interventions):
+    """
+    Expand customers x interventions into one matrix and score it in a single call
+
+    Returns, per customer, the baseline churn probability and the probability
+    delta of each applicable intervention, most effective first.
+    """
+    variants = []
+    owners = []
+    for idx, customer in enumerate(customers):
+        variants.append(customer)
+        owners.append((idx, None))
+        for name, overrides in interventions.items():
+            if intervention_applies(customer, overrides):
+                variants.append({**customer, **overrides})
+                owners.append((idx, name))
+    
+    probabilities = model.predict_proba(preprocess_records(variants))[:, 1]
+    
+    results = [{'index': idx, 'interventions': []} for idx in range(len(customers))]
+    for (idx, name), probability in zip(owners, probabilities):
+        if name is None:
+            results[idx]['churn_probability'] = float(probability)
+            results[idx]['risk_level'] = get_risk_level(probability)
+        else:
+            results[idx]['interventions'].append({
+                'name': name,
+                'overrides': interventions[name],
+                'churn_probability': float(probability),
+                'risk_level': get_risk_level(probability)
+            })
+    
+    for result in results:
+        for item in result['interventions']:
+            item['delta'] = item['churn_probability'] - result['churn_probability']
+        result['interventions'].sort(key=lambda x: x['delta'])
+    
+    return results
+
+
 def get_risk_level(probability):
     """
     Determine risk level based on churn probability
@@ -327,6 +967,9 @@ def get_risk_level(probability):
 def generate_recommendations(data, probability):
     """
     Generate personalized recommendations based on customer data
+
+    Each recommendation names the DEFAULT_INTERVENTIONS entry that models it,
+    or None when the action cannot be expressed as a field change.
     """
     recommendations = []
     
@@ -336,7 +979,8 @@ def generate_recommendations(data, probability):
             'category': 'Contract',
             'priority': 'High',
             'message': 'Upgrade to a long-term contract (1 or 2 years) with a discount to improve retention',
-            'impact': 'High'
+            'impact': 'High',
+            'intervention': 'one_year_contract'
         })
     
     # Tenure recommendations
@@ -345,7 +989,8 @@ def generate_recommendations(data, probability):
             'category': 'Engagement',
             'priority': 'High',
             'message': 'Customer is in the critical first year. Implement welcome program and regular check-ins',
-            'impact': 'High'
+            'impact': 'High',
+            'intervention': None
         })
     
     # Service recommendations
@@ -354,7 +999,8 @@ def generate_recommendations(data, probability):
             'category': 'Services',
             'priority': 'Medium',
             'message': 'Offer online security service with promotional pricing',
-            'impact': 'Medium'
+            'impact': 'Medium',
+            'intervention': 'online_security'
         })
     
     if data.get('TechSupport') != 'Yes' and data.get('InternetService') != 'No':
@@ -362,7 +1008,8 @@ def generate_recommendations(data, probability):
             'category': 'Services',
             'priority': 'Medium',
             'message': 'Provide tech support service to enhance customer satisfaction',
-            'impact': 'Medium'
+            'impact': 'Medium',
+            'intervention': 'tech_support'
         })
     
     # Payment method
@@ -371,7 +1018,8 @@ def generate_recommendations(data, probability):
             'category': 'Payment',
             'priority': 'Medium',
             'message': 'Encourage automatic payment methods with incentives to reduce friction',
-            'impact': 'Medium'
+            'impact': 'Medium',
+            'intervention': 'automatic_payment'
         })
     
     # Paperless billing
@@ -380,7 +1028,8 @@ def generate_recommendations(data, probability):
             'category': 'Engagement',
             'priority': 'Low',
             'message': 'Promote paperless billing with incentives for environmental and convenience benefits',
-            'impact': 'Low'
+            'impact': 'Low',
+            'intervention': 'paperless_billing'
         })
     
     # High charges
@@ -390,7 +1039,8 @@ def generate_recommendations(data, probability):
             'category': 'Pricing',
             'priority': 'High',
             'message': 'Customer has high charges. Consider loyalty discount or bundled service offers',
-            'impact': 'High'
+            'impact': 'High',
+            'intervention': None
         })
     
     # Fiber optic with high churn correlation
@@ -399,7 +1049,8 @@ def generate_recommendations(data, probability):
             'category': 'Service Quality',
             'priority': 'High',
             'message': 'Fiber optic customers show higher churn. Check service quality and consider retention offers',
-            'impact': 'High'
+            'impact': 'High',
+            'intervention': None
         })
     
     return sorted(recommendations, key=lambda x: {'High': 0, 'Medium': 1, 'Low': 2}[x['priority']])
@@ -410,11 +1061,23 @@ def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({'error': f"Request body too large (limit {request.max_content_length} bytes)"}), 413
+
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 
+# Started last so workers resuming queued jobs never see a half-imported module
+if JOBS_ENABLED:
+    job_workers.start()
+
+
 if __name__ == '__main__':
+    # Spawned offload processes cannot re-import a module run as __main__; score inline
+    offload.processes = 0
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
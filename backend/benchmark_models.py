@@ -0,0 +1,219 @@
+"""
+Model Family Benchmark
+Trains XGBoost, LightGBM, CatBoost and a logistic-regression baseline on the
+same engineered features and split as train_model.py, and compares training
+cost, model size, inference latency and ROC-AUC in one table
+
+The data-preparation stages are train_model.prepare_data and share its stage
+cache, so after a training run they are loaded rather than recomputed.
+XGBoost reuses the grid-searched parameters from model_metadata.pkl when it
+exists; the other families use fixed defaults, so each row is labelled
+"tuned" or "default" and ROC-AUC is only like-for-like between equal labels.
+Each family is trained in a fresh process, so its memory figures are not
+inflated by the families benchmarked before it.
+
+Usage:
+    python benchmark_models.py
+    python benchmark_models.py --models xgboost lightgbm --batch-rows 10000
+    python benchmark_models.py --save-challengers   # write models/challengers/*.pkl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+import train_model
+from pipeline import Pipeline
+from profiling import StageProfiler, measure_latency
+import warnings
+warnings.filterwarnings('ignore')
+
+RANDOM_STATE = train_model.RANDOM_STATE
+
+# Each builder returns (unfitted model, 'tuned' or 'default')
+
+
+def build_xgboost(model_dir):
+    from xgboost import XGBClassifier
+
+    # Start from the tuned (and possibly compacted) parameters when available
+    params = {'n_estimators': 200, 'max_depth': 5, 'learning_rate': 0.1}
+    tuning = 'default'
+    metadata_path = os.path.join(model_dir, 'model_metadata.pkl')
+    if os.path.exists(metadata_path):
+        best_params = joblib.load(metadata_path).get('best_params')
+        if best_params:
+            params.update(best_params)
+            tuning = 'tuned'
+    return XGBClassifier(**params, random_state=RANDOM_STATE, eval_metric='logloss'), tuning
+
+
+def build_lightgbm(model_dir):
+    from lightgbm import LGBMClassifier
+
+    return LGBMClassifier(n_estimators=200, max_depth=5, num_leaves=31, learning_rate=0.1,
+                          random_state=RANDOM_STATE, verbose=-1), 'default'
+
+
+def build_catboost(model_dir):
+    from catboost import CatBoostClassifier
+
+    return CatBoostClassifier(iterations=200, depth=5, learning_rate=0.1,
+                              random_seed=RANDOM_STATE, verbose=0, allow_writing_files=False), 'default'
+
+
+def build_logistic_regression(model_dir):
+    from sklearn.linear_model import LogisticRegression
+
+    return LogisticRegression(max_iter=1000, random_state=RANDOM_STATE), 'default'
+
+
+MODEL_FAMILIES = {
+    'xgboost': build_xgboost,
+    'lightgbm': build_lightgbm,
+    'catboost': build_catboost,
+    'logreg': build_logistic_regression
+}
+
+
+def prepare_data(data_path, cache_dir, use_cache):
+    """
+    Scaled splits plus the SMOTE-balanced training set, from train_model's cached stages
+    """
+    stages = train_model.prepare_data(Pipeline(cache_dir=cache_dir, enabled=use_cache), data_path)
+    return {**stages['scale'].outputs, **stages['smote'].outputs}
+
+
+def model_size_bytes(model):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.pkl')
+        joblib.dump(model, path)
+        return os.path.getsize(path)
+
+
+def benchmark_family(name, build, data, model_dir, batch_rows):
+    """
+    Train one model family and measure cost, latency and accuracy
+
+    ``train_rss_increase_mb`` is the fit's peak RSS minus the RSS just before
+    it (psutil only); ``train_peak_rss_mb`` is the whole process's peak.
+    """
+    print(f"\n   Training {name}...")
+    model, tuning = build(model_dir)
+
+    with StageProfiler() as profiler:
+        model.fit(data['X_train_balanced'], data['y_train_balanced'])
+
+    X_test = data['X_test_scaled']
+
+    def predict(X):
+        return model.predict_proba(X)[:, 1]
+
+    # Resample the test split up to the batch size so every family scores the same rows
+    rng = np.random.RandomState(RANDOM_STATE)
+    X_batch = X_test.iloc[rng.randint(0, len(X_test), size=batch_rows)]
+    latency = measure_latency(predict, X_batch)
+
+    return {
+        'model': name,
+        'tuning': tuning,
+        'train_seconds': profiler.stats['wall_seconds'],
+        'train_cpu_seconds': profiler.stats['cpu_seconds'],
+        'train_rss_increase_mb': profiler.stats['rss_increase_mb'],
+        'train_peak_rss_mb': profiler.stats['peak_rss_mb'],
+        'model_size_kb': model_size_bytes(model) / 1024,
+        'single_row_ms': latency['per_row_ms'],
+        'single_row_p95_ms': latency['per_row_p95_ms'],
+        'batch_ms': latency['per_batch_ms'],
+        'batch_rows': latency['batch_rows'],
+        'roc_auc': float(roc_auc_score(data['y_test'], predict(X_test)))
+    }, model
+
+
+def run_family(name, data, model_dir, batch_rows, challenger_dir=None):
+    """
+    Benchmark one family and optionally save it; runs in its own process
+    """
+    row, model = benchmark_family(name, MODEL_FAMILIES[name], data, model_dir, batch_rows)
+    if challenger_dir:
+        os.makedirs(challenger_dir, exist_ok=True)
+        joblib.dump(model, os.path.join(challenger_dir, f"{name}.pkl"))
+        print(f"   ✓ Saved challenger {challenger_dir}/{name}.pkl")
+    return row
+
+
+def print_table(rows):
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else 'n/a'
+
+    batch_rows = rows[0]['batch_rows'] if rows else 0
+    header = (f"   {'Model':<10} {'Params':<8} {'Train (s)':>10} {'Fit RSS (MB)':>14} {'Size (KB)':>10} "
+              f"{'1 row (ms)':>11} {'1 row p95':>10} {f'{batch_rows} rows (ms)':>16} {'ROC-AUC':>8}")
+    print("\n" + header)
+    print("   " + "-" * (len(header) - 3))
+    for r in rows:
+        fit_rss = r['train_rss_increase_mb']
+        if fit_rss is None:
+            fit_rss = r['train_peak_rss_mb']
+        print(f"   {r['model']:<10} {r['tuning']:<8} {r['train_seconds']:>10.2f} {fmt(fit_rss, '>14.1f')} "
+              f"{r['model_size_kb']:>10.1f} {r['single_row_ms']:>11.3f} {r['single_row_p95_ms']:>10.3f} "
+              f"{r['batch_ms']:>16.1f} {r['roc_auc']:>8.4f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare model families on cost, latency and accuracy')
+    parser.add_argument('--data-path', default=train_model.DATA_PATH)
+    parser.add_argument('--model-dir', default=train_model.MODEL_DIR)
+    parser.add_argument('--cache-dir', default=train_model.CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the stage cache')
+    parser.add_argument('--models', nargs='+', choices=list(MODEL_FAMILIES), default=list(MODEL_FAMILIES))
+    parser.add_argument('--batch-rows', type=int, default=10000, help='Rows per batch-latency measurement')
+    parser.add_argument('--output', default=None,
+                        help='Where to write the JSON report (default: <model-dir>/model_benchmark.json)')
+    parser.add_argument('--save-challengers', action='store_true',
+                        help='Save each trained model to <model-dir>/challengers/ for shadow scoring')
+    args = parser.parse_args(argv)
+
+    print("="*80)
+    print("Customer Churn Prediction - Model Family Benchmark")
+    print("="*80)
+
+    data = prepare_data(args.data_path, args.cache_dir, not args.no_cache)
+
+    challenger_dir = os.path.join(args.model_dir, 'challengers') if args.save_challengers else None
+    context = multiprocessing.get_context('spawn')
+
+    rows = []
+    for name in args.models:
+        # A fresh process per family, so earlier fits do not count towards later ones
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                row = executor.submit(run_family, name, data, args.model_dir,
+                                      args.batch_rows, challenger_dir).result()
+            except ImportError as e:
+                print(f"   ! Skipping {name}: {str(e)} (install requirements-train.txt)")
+                continue
+        rows.append(row)
+
+    print("\nResults:")
+    print_table(rows)
+    print("\n   'tuned' rows use train_model.py's grid-searched parameters, 'default' rows fixed ones;")
+    print("   compare ROC-AUC only between rows with the same label. Fit RSS is the memory the fit")
+    print("   added over the RSS before it (the process's peak RSS when psutil is not installed).")
+
+    output = args.output or os.path.join(args.model_dir, 'model_benchmark.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'batch_rows': args.batch_rows, 'results': rows}, f, indent=2)
+    print(f"\n   ✓ Benchmark report saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
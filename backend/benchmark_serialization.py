@@ -0,0 +1,82 @@
+"""
+Serialization Benchmark
+Compares the cost of serializing large batch prediction responses with
+Flask's jsonify, the stdlib json module and responses.dumps (orjson when
+installed)
+
+Usage:
+    python benchmark_serialization.py
+    python benchmark_serialization.py --sizes 1000 10000 100000 --repeats 10
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime
+
+from flask import Flask, jsonify
+
+import responses
+
+RISK_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
+
+def batch_payload(n, seed=42):
+    """
+    A response shaped like /api/predict/batch for ``n`` customers
+    """
+    rng = random.Random(seed)
+    results = []
+    for idx in range(n):
+        probability = rng.random()
+        results.append({
+            'index': idx,
+            'churn': probability >= 0.5,
+            'churn_probability': probability,
+            'confidence': max(probability, 1 - probability),
+            'risk_level': RISK_LEVELS[min(int(probability * 4), 3)]
+        })
+    return {'results': results, 'total': n, 'timestamp': datetime.now().isoformat()}
+
+
+def time_call(func, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        size = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization of batch responses')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    serializers = {
+        'flask.jsonify': lambda payload: len(jsonify(payload).get_data()),
+        'json.dumps': lambda payload: len(json.dumps(payload).encode('utf-8')),
+        'responses.dumps': lambda payload: len(responses.dumps(payload)),
+    }
+
+    print(f"responses.dumps backend: {'orjson' if responses.orjson is not None else 'stdlib json (orjson not installed)'}")
+    print(f"\n{'Rows':>8}  {'Serializer':<16} {'Median (ms)':>12} {'Bytes':>12} {'Speed-up':>9}")
+    print('-' * 62)
+
+    with app.app_context():
+        for n in args.sizes:
+            payload = batch_payload(n)
+            baseline = None
+            for name, serialize in serializers.items():
+                ms, size = time_call(lambda: serialize(payload), args.repeats)
+                baseline = baseline or ms
+                print(f"{n:>8}  {name:<16} {ms:>12.2f} {size:>12} {baseline / ms:>8.1f}x")
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Startup Benchmark
+Measures import time, time to first prediction and image size of the API
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+Pass --baseline-ref to measure an older revision side by side (it is checked
+out into a temporary git worktree), and --build to also build and compare the
+Docker images of both trees.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --baseline-ref HEAD~1 --build
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE_CUSTOMER = {
+    "gender": "Male",
+    "SeniorCitizen": 0,
+    "Partner": "Yes",
+    "Dependents": "No",
+    "tenure": 12,
+    "PhoneService": "Yes",
+    "MultipleLines": "No",
+    "InternetService": "DSL",
+    "OnlineSecurity": "Yes",
+    "OnlineBackup": "No",
+    "DeviceProtection": "No",
+    "TechSupport": "Yes",
+    "StreamingTV": "No",
+    "StreamingMovies": "No",
+    "Contract": "One year",
+    "PaperlessBilling": "No",
+    "PaymentMethod": "Bank transfer (automatic)",
+    "MonthlyCharges": 55.0,
+    "TotalCharges": 660.0
+}
+
+# Runs inside the child interpreter; prints one JSON line of timings
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t_import = time.perf_counter() - t0
+modules_after_import = len(sys.modules)
+heavy = [m for m in ('pandas', 'sklearn', 'xgboost', 'lightgbm', 'catboost', 'imblearn') if m in sys.modules]
+client = app.app.test_client()
+response = client.post('/api/predict', json=json.loads(sys.argv[1]))
+t_first = time.perf_counter() - t0
+print(json.dumps({
+    'import_seconds': t_import,
+    'first_prediction_seconds': t_first,
+    'status': response.status_code,
+    'modules_after_import': modules_after_import,
+    'heavy_modules_after_import': heavy
+}))
+"""
+
+
+def measure_tree(backend_dir, runs):
+    """
+    Median import time and time to first prediction over fresh interpreters
+    """
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE, json.dumps(SAMPLE_CUSTOMER)],
+            cwd=backend_dir, capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    return {
+        'import_seconds': statistics.median(s['import_seconds'] for s in samples),
+        'first_prediction_seconds': statistics.median(s['first_prediction_seconds'] for s in samples),
+        'modules_after_import': samples[-1]['modules_after_import'],
+        'heavy_modules_after_import': samples[-1]['heavy_modules_after_import'],
+        'status': samples[-1]['status']
+    }
+
+
+def image_size(backend_dir, tag):
+    """
+    Build the backend image and return its size in bytes, or None without docker
+    """
+    if shutil.which('docker') is None:
+        return None
+    subprocess.run(['docker', 'build', '-q', '-t', tag, backend_dir], check=True, capture_output=True)
+    out = subprocess.run(['docker', 'image', 'inspect', '-f', '{{.Size}}', tag],
+                         check=True, capture_output=True, text=True)
+    return int(out.stdout.strip())
+
+
+def baseline_worktree(ref):
+    """
+    Check out ``ref`` into a temporary worktree and return (worktree, backend dir)
+    """
+    worktree = tempfile.mkdtemp(prefix='churn-baseline-')
+    subprocess.run(['git', 'worktree', 'add', '--detach', worktree, ref],
+                   cwd=BACKEND_DIR, check=True, capture_output=True)
+    rel = os.path.relpath(BACKEND_DIR, subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'], cwd=BACKEND_DIR,
+        check=True, capture_output=True, text=True).stdout.strip())
+    return worktree, os.path.join(worktree, rel)
+
+
+def print_table(results):
+    labels = list(results)
+    print(f"\n{'Metric':<28}" + ''.join(f"{label:>16}" for label in labels))
+    print('-' * (28 + 16 * len(labels)))
+    rows = [
+        ('Import time (s)', 'import_seconds', '{:.3f}'),
+        ('Time to first predict (s)', 'first_prediction_seconds', '{:.3f}'),
+        ('Modules after import', 'modules_after_import', '{}'),
+        ('Heavy modules after import', 'heavy_modules_after_import', '{}'),
+        ('Image size (MB)', 'image_mb', '{:.0f}'),
+    ]
+    for title, key, fmt in rows:
+        cells = []
+        for label in labels:
+            value = results[label].get(key)
+            if isinstance(value, list):
+                value = ','.join(value) or '-'
+            cells.append(f"{fmt.format(value) if value is not None else 'n/a':>16}")
+        print(f"{title:<28}" + ''.join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark API cold start')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per measurement')
+    parser.add_argument('--baseline-ref', help='Git revision to compare against (e.g. the commit before lazy loading)')
+    parser.add_argument('--build', action='store_true', help='Also build Docker images and compare sizes')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    trees = {}
+    worktree = None
+    if args.baseline_ref:
+        worktree, trees['baseline'] = baseline_worktree(args.baseline_ref)
+    trees['current'] = BACKEND_DIR
+
+    # PRELOAD_MODEL=0 so the import time is not competing with the loader thread;
+    # no job queue (it would create jobs.db and start workers) or shadow scoring
+    os.environ['PRELOAD_MODEL'] = '0'
+    os.environ['JOBS_ENABLED'] = '0'
+    os.environ['SHADOW_ENABLED'] = '0'
+
+    results = {}
+    try:
+        for label, backend_dir in trees.items():
+            print(f"Measuring {label} ({backend_dir})...")
+            results[label] = measure_tree(backend_dir, args.runs)
+            if args.build:
+                size = image_size(backend_dir, f"churn-backend:bench-{label}")
+                results[label]['image_mb'] = size / (1024 * 1024) if size is not None else None
+    finally:
+        if worktree is not None:
+            subprocess.run(['git', 'worktree', 'remove', '--force', worktree],
+                           cwd=BACKEND_DIR, capture_output=True)
+
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration
+
+Threaded workers let the admission lanes in admission.py keep interactive
+requests flowing while batch work is in flight. A request queued or running
+on a lane holds one of the worker's threads, so ``threads`` must cover every
+lane at once (6 interactive + 2 batch + 4 jobs = 12 by default) plus headroom
+for the endpoints outside the lanes: health checks, job polling, features and
+model info. The default is 12 + 4 = 16. If the ADMISSION_<LANE>_CONCURRENCY /
+_QUEUE limits are raised, raise GUNICORN_THREADS to match; each worker logs a
+warning when the lanes leave no threads over.
+"""
+
+import os
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def post_worker_init(worker):
+    app_module = sys.modules.get('app')
+    if app_module is None:
+        return
+    needed = app_module.admission.threads_needed()
+    if needed > worker.cfg.threads:
+        worker.log.warning(f"Admission lanes can hold {needed} threads but the worker has "
+                           f"{worker.cfg.threads}; non-interactive lanes may starve /api/predict. "
+                           f"Set GUNICORN_THREADS above {needed}.")
+    elif needed == worker.cfg.threads:
+        worker.log.warning(f"Admission lanes can hold all {needed} of the worker's threads, leaving "
+                           f"none for health checks and job polling. Set GUNICORN_THREADS above {needed}.")
@@ -0,0 +1,326 @@
+"""
+Batch Scoring Jobs
+A durable, SQLite-backed local job queue and the worker threads that drain it
+
+Each job's input is written to ``<jobs_dir>/<job_id>/input.jsonl`` and its
+results to one ``chunks/<offset>.jsonl`` file per scored chunk. Progress is
+checkpointed in the database after every chunk and the running worker
+refreshes the job's heartbeat in the background, so a job interrupted by a
+crash or restart is picked up again by any worker once its heartbeat goes
+stale, resuming from the last completed chunk.
+"""
+
+import itertools
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    chunk_size INTEGER NOT NULL,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+QUEUED, RUNNING, COMPLETED, FAILED = 'queued', 'running', 'completed', 'failed'
+
+
+class JobStore:
+    """
+    Job metadata in SQLite plus input/result files on local disk
+
+    Safe to share between threads and between processes on the same host; a
+    job is claimed with a single ``BEGIN IMMEDIATE`` transaction so only one
+    worker ever runs it at a time.
+    """
+
+    def __init__(self, jobs_dir, stale_after=60.0, max_attempts=3):
+        self.jobs_dir = jobs_dir
+        self.db_path = os.path.join(jobs_dir, 'jobs.db')
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        os.makedirs(jobs_dir, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def chunk_path(self, job_id, offset):
+        return os.path.join(self.job_dir(job_id), 'chunks', f"{offset:012d}.jsonl")
+
+    def submit(self, records, chunk_size):
+        """
+        Persist the input records and enqueue a job; returns the job dict
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self.job_dir(job_id)
+        os.makedirs(os.path.join(job_dir, 'chunks'))
+
+        tmp_path = os.path.join(job_dir, 'input.jsonl.tmp')
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write('\n')
+        os.replace(tmp_path, os.path.join(job_dir, 'input.jsonl'))
+
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, total, chunk_size, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, QUEUED, len(records), chunk_size, now, now)
+            )
+        return self.get(job_id)
+
+    def spool(self, stream, block_size=1 << 20):
+        """
+        Copy an uploaded body to ``uploads/<random>.json`` without parsing it; returns the path
+        """
+        uploads_dir = os.path.join(self.jobs_dir, 'uploads')
+        os.makedirs(uploads_dir, exist_ok=True)
+        path = os.path.join(uploads_dir, f"{uuid.uuid4().hex}.json")
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(stream, f, block_size)
+        return path
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def claim(self, worker):
+        """
+        Atomically take the oldest queued job, or a running job whose worker went quiet
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? OR (status = ? AND heartbeat < ?) '
+                'ORDER BY created_at LIMIT 1',
+                (QUEUED, RUNNING, now - self.stale_after)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            if row['attempts'] >= self.max_attempts:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? WHERE id = ?',
+                    (FAILED, f"Gave up after {row['attempts']} attempts", now, now, row['id'])
+                )
+                conn.execute('COMMIT')
+                return None
+
+            if row['status'] == RUNNING:
+                logger.warning(f"Resuming stale job {row['id']} from worker {row['worker']} "
+                               f"at {row['processed']}/{row['total']}")
+            conn.execute(
+                'UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, heartbeat = ?, '
+                'started_at = COALESCE(started_at, ?), updated_at = ? WHERE id = ?',
+                (RUNNING, worker, now, now, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return self.get(row['id'])
+
+    # The updates below only apply while ``worker`` still owns the running job;
+    # each returns False once the job was reclaimed, finished or deleted.
+
+    def heartbeat(self, job_id, worker):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute('UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND status = ?',
+                                  (time.time(), job_id, worker, RUNNING))
+        return cursor.rowcount > 0
+
+    def checkpoint(self, job_id, worker, processed):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET processed = ?, heartbeat = ?, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND status = ?',
+                (processed, now, now, job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def finish(self, job_id, worker, error=None):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND status = ?',
+                (FAILED if error else COMPLETED, error, now, now, job_id, worker, RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def open_input(self, job_id):
+        return open(os.path.join(self.job_dir(job_id), 'input.jsonl'))
+
+    def write_chunk(self, job_id, offset, results):
+        path = self.chunk_path(job_id, offset)
+        # Unique per writer, so a worker that lost the job cannot clobber the new owner's file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            for result in results:
+                f.write(json.dumps(result))
+                f.write('\n')
+        os.replace(tmp_path, path)
+
+    def iter_results(self, job_id):
+        """
+        Yield result dicts of a completed job in input order
+        """
+        chunks_dir = os.path.join(self.job_dir(job_id), 'chunks')
+        for name in sorted(n for n in os.listdir(chunks_dir) if n.endswith('.jsonl')):
+            with open(os.path.join(chunks_dir, name)) as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def delete(self, job_id):
+        with closing(self._connect()) as conn:
+            conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+
+class JobWorkerPool:
+    """
+    Background threads that claim jobs and score them chunk by chunk
+
+    ``score(records, offset)`` must return one result dict per record. Chunk
+    files are written atomically before the checkpoint, and chunks already on
+    disk are skipped, so re-running part of a job after a crash is harmless.
+    While a job runs, a side thread refreshes its heartbeat every
+    ``stale_after / 4`` seconds, so slow chunks are not mistaken for a dead
+    worker; if the job is lost anyway the worker stops at the next chunk.
+    """
+
+    def __init__(self, store, score, workers=1, poll_interval=1.0):
+        self.store = store
+        self.score = score
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._identity = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._loop, args=(f"{self._identity}:{i}",),
+                                          name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+    def restart_after_fork(self):
+        """
+        Threads do not survive ``fork``; start a fresh set in the child process
+        """
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stop = threading.Event()
+        self._identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.start()
+
+    def _loop(self, worker):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim(worker)
+            except Exception as e:
+                logger.error(f"Job claim error: {str(e)}")
+                job = None
+
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            lost = threading.Event()
+            done = threading.Event()
+            beater = threading.Thread(target=self._heartbeat, args=(job['id'], worker, lost, done),
+                                      name=f"{threading.current_thread().name}-heartbeat", daemon=True)
+            beater.start()
+            try:
+                self.run_job(job, worker, lost)
+            except Exception as e:
+                logger.error(f"Job {job['id']} failed: {str(e)}")
+                self.store.finish(job['id'], worker, error=str(e))
+            finally:
+                done.set()
+                beater.join()
+
+    def _heartbeat(self, job_id, worker, lost, done):
+        while not done.wait(self.store.stale_after / 4):
+            try:
+                if not self.store.heartbeat(job_id, worker):
+                    lost.set()
+                    return
+            except Exception as e:
+                logger.error(f"Job {job_id} heartbeat error: {str(e)}")
+
+    def run_job(self, job, worker, lost=None):
+        job_id, total, chunk_size = job['id'], job['total'], job['chunk_size']
+        lost = lost or threading.Event()
+        # Resume from the last checkpointed chunk boundary
+        offset = (job['processed'] // chunk_size) * chunk_size
+
+        with self.store.open_input(job_id) as f:
+            lines = itertools.islice(f, offset, None)
+            while offset < total:
+                if self._stop.is_set():
+                    return
+                chunk = list(itertools.islice(lines, chunk_size))
+                stop = offset + len(chunk)
+                if not os.path.exists(self.store.chunk_path(job_id, offset)):
+                    records = [json.loads(line) for line in chunk]
+                    results = self.score(records, offset)
+                    if lost.is_set():
+                        break
+                    self.store.write_chunk(job_id, offset, results)
+                if not self.store.checkpoint(job_id, worker, stop):
+                    break
+                offset = stop
+            else:
+                if self.store.finish(job_id, worker):
+                    logger.info(f"Job {job_id} completed ({total} records)")
+                    return
+
+        logger.warning(f"Job {job_id} was taken over or removed; {worker} stopped at {offset}/{total}")
@@ -0,0 +1,140 @@
+"""
+Load Test
+Measures single-prediction latency with and without concurrent batch traffic
+to check that batch uploads do not degrade interactive requests
+
+Start the server first (e.g. gunicorn --config gunicorn.conf.py app:app), then:
+    python load_test.py
+    python load_test.py --requests 2000 --batch-size 5000 --batch-clients 4
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:5000"
+
+CUSTOMER = {
+    "gender": "Female",
+    "SeniorCitizen": 1,
+    "Partner": "No",
+    "Dependents": "No",
+    "tenure": 2,
+    "PhoneService": "Yes",
+    "MultipleLines": "No",
+    "InternetService": "Fiber optic",
+    "OnlineSecurity": "No",
+    "OnlineBackup": "No",
+    "DeviceProtection": "No",
+    "TechSupport": "No",
+    "StreamingTV": "Yes",
+    "StreamingMovies": "Yes",
+    "Contract": "Month-to-month",
+    "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check",
+    "MonthlyCharges": 95.0,
+    "TotalCharges": 190.0
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def interactive_phase(base_url, n_requests, concurrency):
+    """
+    Fire ``n_requests`` single predictions and return latencies (ms) and status counts
+    """
+    session = requests.Session()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        response = session.post(f"{base_url}/api/predict", json=CUSTOMER)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_requests)))
+    return latencies, statuses
+
+
+def batch_flood(base_url, batch_size, stop, statuses, lock):
+    """
+    Keep posting batch requests until ``stop`` is set
+    """
+    session = requests.Session()
+    payload = [CUSTOMER] * batch_size
+    while not stop.is_set():
+        response = session.post(f"{base_url}/api/predict/batch", json=payload)
+        with lock:
+            statuses[response.status_code] += 1
+        if response.status_code in (429, 503):
+            time.sleep(float(response.headers.get('Retry-After', 1)) / 10)
+
+
+def summarize(label, latencies, statuses):
+    if not latencies:
+        print(f"{label:<22} no successful requests ({dict(statuses)})")
+        return
+    print(f"{label:<22} n={len(latencies):<6} "
+          f"p50={statistics.median(latencies):7.1f}ms  "
+          f"p95={percentile(latencies, 95):7.1f}ms  "
+          f"p99={percentile(latencies, 99):7.1f}ms  "
+          f"max={max(latencies):7.1f}ms  statuses={dict(statuses)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Interactive vs batch isolation load test')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--requests', type=int, default=500, help='Single predictions per phase')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent interactive clients')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Records per batch request')
+    parser.add_argument('--batch-clients', type=int, default=4, help='Concurrent batch clients')
+    args = parser.parse_args(argv)
+
+    # Warm up every worker
+    interactive_phase(args.base_url, 20, args.concurrency)
+
+    print(f"Phase 1: {args.requests} single predictions, no batch load")
+    baseline, baseline_statuses = interactive_phase(args.base_url, args.requests, args.concurrency)
+
+    print(f"Phase 2: same, with {args.batch_clients} clients posting {args.batch_size}-record batches")
+    stop = threading.Event()
+    batch_statuses = Counter()
+    lock = threading.Lock()
+    flooders = [threading.Thread(target=batch_flood,
+                                 args=(args.base_url, args.batch_size, stop, batch_statuses, lock))
+                for _ in range(args.batch_clients)]
+    for t in flooders:
+        t.start()
+    time.sleep(1)  # let the batch lane fill up
+    try:
+        loaded, loaded_statuses = interactive_phase(args.base_url, args.requests, args.concurrency)
+    finally:
+        stop.set()
+        for t in flooders:
+            t.join()
+
+    print("\nInteractive /api/predict latency")
+    print("-" * 100)
+    summarize('without batch load', baseline, baseline_statuses)
+    summarize('with batch load', loaded, loaded_statuses)
+    if baseline and loaded:
+        print(f"\np99 ratio (loaded / baseline): {percentile(loaded, 99) / percentile(baseline, 99):.2f}x")
+    print(f"Batch responses during phase 2: {dict(batch_statuses)} (429/503 = shed by admission control)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Batch Offload
+Runs batch scoring in separate, lower-priority processes
+
+Parsing a large JSON body, building a DataFrame from it and serializing the
+results all hold the GIL, so a batch request scored on a web worker's thread
+stalls the interactive requests on the same worker however the threads are
+pooled. Offloaded work runs in child processes started with ``spawn`` that
+import the app module once and are reniced, so the OS scheduler also favours
+the web workers when CPU is short. Arguments and return values are pickled;
+pass request bodies as bytes and return serialized responses.
+"""
+
+import importlib
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+def _init_process(module_name, nice, env):
+    os.environ.update(env)
+    if nice and hasattr(os, 'nice'):
+        os.nice(nice)
+    module = importlib.import_module(module_name)
+    # Load the model up front rather than on the first task
+    loader = getattr(module, 'load_artifacts', None)
+    if loader is not None:
+        loader()
+
+
+class ProcessOffload:
+    """
+    A lazily started pool of ``processes`` child processes for one web worker
+
+    With ``processes=0`` work runs inline on the calling thread, as before.
+    ``env`` is applied in each child before ``module_name`` is imported, so
+    the child can skip the web worker's own background threads.
+    """
+
+    def __init__(self, module_name, processes=1, nice=10, env=None):
+        self.module_name = module_name
+        self.processes = processes
+        self.nice = nice
+        self.env = dict(env or {})
+        self.tasks = 0
+        self.restarts = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.processes > 0
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                import multiprocessing
+
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_process,
+                    initargs=(self.module_name, self.nice, self.env)
+                )
+            return self._executor
+
+    def run(self, func, *args):
+        """
+        Call ``func(*args)`` in a child process and wait for its result
+
+        ``func`` must be a module-level function of an importable module.
+        """
+        if not self.enabled:
+            return func(*args)
+
+        executor = self._pool()
+        with self._lock:
+            self.tasks += 1
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            # A child died (e.g. killed for memory); start a fresh pool next time
+            logger.error('Batch offload process died; restarting the pool')
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+                    self.restarts += 1
+            executor.shutdown(wait=False)
+            raise
+
+    def reset_after_fork(self):
+        """
+        A pool inherited through ``fork`` is unusable in the child; start over lazily
+        """
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'processes': self.processes,
+                'nice': self.nice,
+                'started': self._executor is not None,
+                'tasks': self.tasks,
+                'restarts': self.restarts
+            }
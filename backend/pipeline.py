@@ -0,0 +1,322 @@
+"""
+Training Pipeline Stage Runner
+Runs named pipeline stages, caches their outputs on disk keyed by content,
+and profiles each stage
+"""
+
+import dis
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+import uuid
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from profiling import StageProfiler, dump_profile
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_params(*parts):
+    """
+    Stable SHA-256 of JSON-serializable parameters
+    """
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return getattr(func, '__qualname__', repr(func))
+
+
+def _referenced_names(code):
+    names = {ins.argval for ins in dis.get_instructions(code) if ins.opname == 'LOAD_GLOBAL'}
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def _local_helpers(func, root):
+    """
+    Module-level functions ``func`` calls that are defined in a file under ``root``
+    """
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return []
+    helpers = []
+    for name in sorted(_referenced_names(code)):
+        helper = getattr(func, '__globals__', {}).get(name)
+        if not inspect.isfunction(helper):
+            continue
+        path = inspect.getsourcefile(helper) or ''
+        if os.path.abspath(path).startswith(root + os.sep):
+            helpers.append(helper)
+    return helpers
+
+
+def _stage_source(func):
+    """
+    Source code of a stage function and of the project helpers it calls,
+    transitively, so that editing either invalidates the stage's cache
+    """
+    try:
+        root = os.path.dirname(os.path.abspath(inspect.getsourcefile(func)))
+    except TypeError:
+        return _source(func)
+
+    sources = []
+    seen = set()
+    pending = [func]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        sources.append(f"{current.__module__}.{current.__qualname__}\n{_source(current)}")
+        pending.extend(_local_helpers(current, root))
+    return '\n'.join(sorted(sources))
+
+
+class StageResult:
+    """
+    Outputs of a single stage plus the content digest downstream stages are keyed on
+    """
+
+    def __init__(self, name, outputs, digest):
+        self.name = name
+        self.outputs = outputs
+        self.digest = digest
+
+    def __getitem__(self, key):
+        return self.outputs[key]
+
+
+class StageCache:
+    """
+    On-disk cache of stage outputs
+
+    DataFrames and Series are stored as Parquet (when pyarrow is installed),
+    numpy arrays as NPZ and everything else (fitted encoders, scalers, models)
+    with joblib. Each entry lives in ``<cache_dir>/<stage>/<key>/`` next to a
+    manifest describing how to load it back.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _entry_dir(self, name, key):
+        return os.path.join(self.cache_dir, name, key)
+
+    def load(self, name, key):
+        """
+        Load a cached entry, or return None if it is missing or unreadable
+        """
+        entry_dir = self._entry_dir(name, key)
+        manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            outputs = {}
+            for output_name, spec in manifest['outputs'].items():
+                outputs[output_name] = self._read(os.path.join(entry_dir, spec['file']), spec)
+            return StageResult(name, outputs, manifest['digest'])
+        except Exception as e:
+            print(f"   ! Ignoring unreadable cache entry {name}/{key[:12]}: {str(e)}")
+            return None
+
+    def save(self, name, key, outputs):
+        """
+        Write stage outputs atomically and return the resulting StageResult
+        """
+        final_dir = self._entry_dir(name, key)
+        tmp_dir = f"{final_dir}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(tmp_dir)
+
+        try:
+            manifest = {'stage': name, 'key': key, 'created': time.time(), 'outputs': {}}
+            digest = hashlib.sha256()
+
+            for output_name in sorted(outputs):
+                spec = self._write(tmp_dir, output_name, outputs[output_name])
+                manifest['outputs'][output_name] = spec
+                digest.update(output_name.encode('utf-8'))
+                digest.update(hash_file(os.path.join(tmp_dir, spec['file'])).encode('utf-8'))
+
+            manifest['digest'] = digest.hexdigest()
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            if os.path.exists(final_dir):
+                shutil.rmtree(final_dir)
+            os.replace(tmp_dir, final_dir)
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return StageResult(name, outputs, manifest['digest'])
+
+    @staticmethod
+    def _write(directory, output_name, value):
+        if isinstance(value, pd.Series) and PARQUET_AVAILABLE:
+            file_name = f"{output_name}.parquet"
+            series_name = value.name
+            value.to_frame(name='__series__').to_parquet(os.path.join(directory, file_name))
+            return {'file': file_name, 'format': 'parquet-series', 'series_name': series_name}
+
+        if isinstance(value, pd.DataFrame) and PARQUET_AVAILABLE:
+            file_name = f"{output_name}.parquet"
+            value.to_parquet(os.path.join(directory, file_name))
+            return {'file': file_name, 'format': 'parquet'}
+
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            file_name = f"{output_name}.npz"
+            np.savez(os.path.join(directory, file_name), value=value)
+            return {'file': file_name, 'format': 'npz'}
+
+        file_name = f"{output_name}.joblib"
+        joblib.dump(value, os.path.join(directory, file_name))
+        return {'file': file_name, 'format': 'joblib'}
+
+    @staticmethod
+    def _read(path, spec):
+        fmt = spec['format']
+        if fmt == 'parquet':
+            return pd.read_parquet(path)
+        if fmt == 'parquet-series':
+            return pd.read_parquet(path)['__series__'].rename(spec.get('series_name'))
+        if fmt == 'npz':
+            with np.load(path, allow_pickle=False) as data:
+                return data['value']
+        return joblib.load(path)
+
+
+class Pipeline:
+    """
+    Runs named stages, reusing cached outputs when a stage's inputs are unchanged
+
+    A stage's cache key is a hash of its name, its source code (including the
+    helpers it calls from this directory), its parameters
+    and the content digests of the upstream stages it consumes, so re-running a
+    stage that produces identical output still lets downstream stages hit.
+    """
+
+    def __init__(self, cache_dir=None, force=(), enabled=True, cprofile=None):
+        self.cache = StageCache(cache_dir) if (enabled and cache_dir) else None
+        self.force = set(force)
+        self.cprofile = cprofile
+        self.timings = []
+        self.hottest_profile = None
+
+    def is_forced(self, name):
+        return 'all' in self.force or name in self.force
+
+    def run(self, name, func, params=None, inputs=(), cache=True, key_ignore=()):
+        """
+        Run ``func(**upstream_outputs, **params)`` as stage ``name``
+
+        ``func`` must return a dict of named outputs. Parameters listed in
+        ``key_ignore`` are passed to the stage but left out of its cache key.
+        """
+        params = params or {}
+        kwargs = {}
+        for upstream in inputs:
+            kwargs.update(upstream.outputs)
+
+        key_params = {k: v for k, v in params.items() if k not in key_ignore}
+        key = hash_params(name, _stage_source(func), key_params, [upstream.digest for upstream in inputs])
+        use_cache = cache and self.cache is not None
+        forced = use_cache and self.is_forced(name)
+
+        with StageProfiler(cprofile=self.cprofile in ('auto', name)) as profiler:
+            result = None
+            if use_cache and not forced:
+                result = self.cache.load(name, key)
+
+            if result is not None:
+                status = 'hit'
+            else:
+                outputs = func(**kwargs, **params)
+                if use_cache:
+                    result = self.cache.save(name, key, outputs)
+                    status = 'forced' if forced else 'miss'
+                else:
+                    result = StageResult(name, outputs, key)
+                    status = 'off'
+
+        timing = {'stage': name, 'status': status, 'seconds': profiler.stats['wall_seconds'], 'key': key}
+        timing.update(profiler.stats)
+        self.timings.append(timing)
+
+        # With cprofile='auto' every stage is profiled and the slowest one kept
+        if profiler.profile is not None and (
+                self.hottest_profile is None or timing['seconds'] > self.hottest_profile[1]):
+            self.hottest_profile = (name, timing['seconds'], profiler.profile)
+
+        if status == 'hit':
+            print(f"   ↺ {name}: loaded from cache ({timing['seconds']:.2f}s)")
+        return result
+
+    def print_summary(self):
+        """
+        Print a per-stage timing table showing cache hits, CPU time and peak memory
+        """
+        total = sum(t['seconds'] for t in self.timings)
+        total_cpu = sum(t['cpu_seconds'] for t in self.timings)
+        print(f"\n   {'Stage':<16} {'Cache':<8} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak RSS (MB)':>14}")
+        print(f"   {'-' * 16} {'-' * 8} {'-' * 10} {'-' * 10} {'-' * 14}")
+        for t in self.timings:
+            peak = f"{t['peak_rss_mb']:.1f}" if t['peak_rss_mb'] is not None else 'n/a'
+            print(f"   {t['stage']:<16} {t['status']:<8} {t['seconds']:>10.2f} {t['cpu_seconds']:>10.2f} {peak:>14}")
+        print(f"   {'-' * 16} {'-' * 8} {'-' * 10} {'-' * 10} {'-' * 14}")
+        print(f"   {'total':<16} {'':<8} {total:>10.2f} {total_cpu:>10.2f}")
+
+    def write_report(self, path, extra=None):
+        """
+        Write per-stage timings (plus any extra sections) as a JSON report
+        """
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'stages': self.timings,
+            'total_wall_seconds': sum(t['seconds'] for t in self.timings),
+            'total_cpu_seconds': sum(t['cpu_seconds'] for t in self.timings)
+        }
+        if self.hottest_profile is not None:
+            name, seconds, profile = self.hottest_profile
+            prof_path = os.path.splitext(path)[0] + f"_{name}.prof"
+            report['cprofile'] = {'stage': name, 'wall_seconds': seconds, 'path': dump_profile(profile, prof_path)}
+        report.update(extra or {})
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=repr)
+        return report
@@ -0,0 +1,235 @@
+"""
+Training Pipeline Profiling
+Measures wall time, CPU time and peak memory of pipeline stages, and
+inference latency of trained models
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+def _process_tree():
+    """
+    The current process and its live children (e.g. joblib/loky workers)
+    """
+    proc = psutil.Process()
+    try:
+        return [proc] + proc.children(recursive=True)
+    except psutil.Error:
+        return [proc]
+
+
+def _tree_rss():
+    total = 0
+    for proc in _process_tree():
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def _children_cpu():
+    """
+    CPU seconds used so far by live child processes
+    """
+    if psutil is None:
+        return 0.0
+
+    total = 0.0
+    for proc in _process_tree()[1:]:
+        try:
+            times = proc.cpu_times()
+            total += times.user + times.system
+        except psutil.Error:
+            pass
+    return total
+
+
+def _maxrss_bytes():
+    """
+    Lifetime peak RSS of this process from getrusage (KiB on Linux, bytes on macOS)
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class MemorySampler:
+    """
+    Background thread tracking the peak RSS of the process tree while running
+
+    Falls back to the process's lifetime high-water mark from getrusage when
+    psutil is not installed, in which case peaks are cumulative across stages.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def source(self):
+        if psutil is not None:
+            return 'psutil (process + children, sampled)'
+        if resource is not None:
+            return 'getrusage ru_maxrss (process lifetime)'
+        return 'unavailable'
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak or 0, _tree_rss())
+
+    def start(self):
+        if psutil is not None:
+            self.peak = _tree_rss()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak or 0, _tree_rss())
+        else:
+            self.peak = _maxrss_bytes()
+        return self.peak
+
+
+class StageProfiler:
+    """
+    Context manager recording wall time, CPU time and peak RSS of a block
+
+    CPU time covers this process plus any live child processes, so joblib
+    workers used by the grid search are included on a best-effort basis.
+    With psutil, ``rss_increase_mb`` is the peak minus the RSS on entry, i.e.
+    what the block itself added. Pass ``cprofile=True`` to also collect a
+    cProfile of the block.
+    """
+
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.profile = None
+        self.stats = {}
+
+    def __enter__(self):
+        self._start_rss = _tree_rss() if psutil is not None else None
+        self._sampler = MemorySampler().start()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._children_cpu = _children_cpu()
+        if self.cprofile:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profile is not None:
+            self.profile.disable()
+        wall = time.perf_counter() - self._wall
+        cpu = (time.process_time() - self._cpu) + max(0.0, _children_cpu() - self._children_cpu)
+        peak = self._sampler.stop()
+        self.stats = {
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'peak_rss_mb': peak / (1024 * 1024) if peak is not None else None,
+            'rss_increase_mb': (max(0, peak - self._start_rss) / (1024 * 1024)
+                                if peak is not None and self._start_rss is not None else None),
+            'rss_source': self._sampler.source
+        }
+        return False
+
+
+def grid_search_timings(cv_results):
+    """
+    Per-candidate fit/score times from a fitted GridSearchCV's ``cv_results_``
+
+    scikit-learn only keeps the mean and standard deviation of fit times over
+    the folds, so per-fold detail is limited to each split's test score.
+    """
+    n_candidates = len(cv_results['params'])
+    split_keys = sorted(
+        (k for k in cv_results if k.startswith('split') and k.endswith('_test_score')),
+        key=lambda k: int(k[len('split'):-len('_test_score')])
+    )
+
+    candidates = []
+    for i in range(n_candidates):
+        candidates.append({
+            'params': cv_results['params'][i],
+            'mean_fit_time': float(cv_results['mean_fit_time'][i]),
+            'std_fit_time': float(cv_results['std_fit_time'][i]),
+            'mean_score_time': float(cv_results['mean_score_time'][i]),
+            'mean_test_score': float(cv_results['mean_test_score'][i]),
+            'rank_test_score': int(cv_results['rank_test_score'][i]),
+            'split_test_scores': [float(cv_results[k][i]) for k in split_keys]
+        })
+
+    n_splits = len(split_keys)
+    total_fit = sum(c['mean_fit_time'] * n_splits for c in candidates)
+    return {
+        'n_candidates': n_candidates,
+        'n_splits': n_splits,
+        'n_fits': n_candidates * n_splits,
+        'total_fit_seconds': total_fit,
+        'candidates': sorted(candidates, key=lambda c: c['mean_fit_time'], reverse=True)
+    }
+
+
+def dump_profile(profile, path):
+    """
+    Write cProfile stats in pstats format (readable by pstats, snakeviz, etc.)
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    profile.dump_stats(path)
+    return path
+
+
+def measure_latency(predict, X, single_rows=200, batch_repeats=5):
+    """
+    Median latency of ``predict`` on single rows and on the whole of ``X``
+
+    ``X`` is a DataFrame; single-row calls use one-row slices to include the
+    per-call overhead a request pays. Times are returned in milliseconds.
+    """
+    import numpy as np
+
+    predict(X.iloc[:1])  # warm-up
+
+    n_single = min(single_rows, len(X))
+    single = []
+    for i in range(n_single):
+        row = X.iloc[i:i + 1]
+        start = time.perf_counter()
+        predict(row)
+        single.append(time.perf_counter() - start)
+
+    batch = []
+    for _ in range(batch_repeats):
+        start = time.perf_counter()
+        predict(X)
+        batch.append(time.perf_counter() - start)
+
+    return {
+        'per_row_ms': float(np.median(single) * 1000),
+        'per_row_p95_ms': float(np.percentile(single, 95) * 1000),
+        'per_batch_ms': float(np.median(batch) * 1000),
+        'batch_rows': int(len(X))
+    }
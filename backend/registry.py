@@ -0,0 +1,213 @@
+"""
+Model Registry
+Serves the champion model's predictions and shadow-scores challenger models
+in the background for side-by-side comparison
+"""
+
+import glob
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ChallengerStats:
+    """
+    Running comparison of one challenger against the champion
+    """
+
+    def __init__(self, bins, threshold):
+        import numpy as np
+
+        self.threshold = threshold
+        self.edges = np.linspace(0.0, 1.0, bins + 1)
+        self.champion_hist = np.zeros(bins, dtype=int)
+        self.challenger_hist = np.zeros(bins, dtype=int)
+        self.rows = 0
+        self.calls = 0
+        self.errors = 0
+        self.agreements = 0
+        self.abs_diff_sum = 0.0
+        self.max_abs_diff = 0.0
+        self.champion_sum = 0.0
+        self.challenger_sum = 0.0
+        self.seconds = 0.0
+
+    def update(self, champion, challenger, seconds):
+        import numpy as np
+
+        diff = np.abs(challenger - champion)
+        self.rows += len(champion)
+        self.calls += 1
+        self.agreements += int(((champion >= self.threshold) == (challenger >= self.threshold)).sum())
+        self.abs_diff_sum += float(diff.sum())
+        self.max_abs_diff = max(self.max_abs_diff, float(diff.max()))
+        self.champion_sum += float(champion.sum())
+        self.challenger_sum += float(challenger.sum())
+        self.champion_hist += np.histogram(champion, bins=self.edges)[0]
+        self.challenger_hist += np.histogram(challenger, bins=self.edges)[0]
+        self.seconds += seconds
+
+    def as_dict(self):
+        rows = self.rows or 1
+        calls = self.calls or 1
+        return {
+            'rows_scored': self.rows,
+            'errors': self.errors,
+            'agreement_rate': self.agreements / rows if self.rows else None,
+            'mean_abs_diff': self.abs_diff_sum / rows if self.rows else None,
+            'max_abs_diff': self.max_abs_diff if self.rows else None,
+            'mean_probability': {
+                'champion': self.champion_sum / rows if self.rows else None,
+                'challenger': self.challenger_sum / rows if self.rows else None
+            },
+            'histogram': {
+                'bin_edges': [float(e) for e in self.edges],
+                'champion': self.champion_hist.tolist(),
+                'challenger': self.challenger_hist.tolist()
+            },
+            'latency_ms': {
+                'per_call': self.seconds / calls * 1000 if self.calls else None,
+                'per_row': self.seconds / rows * 1000 if self.rows else None
+            }
+        }
+
+
+class ModelRegistry:
+    """
+    Champion/challenger registry with off-hot-path shadow scoring
+
+    Challengers are joblib pickles in ``challenger_dir`` (``<name>.pkl``) that
+    accept the same preprocessed feature frame as the champion. They are loaded
+    lazily on the shadow worker, never on a request thread. ``submit`` only
+    enqueues a copy of the feature matrix and returns immediately. At most
+    ``max_pending_rows`` rows are queued at once: a batch is truncated to the
+    remaining room, or dropped when there is none, and skipped rows are counted.
+
+    Statistics are kept per process, so each gunicorn worker reports its own.
+    """
+
+    def __init__(self, champion_name, challenger_dir, workers=1, max_pending_rows=100000,
+                 threshold=0.5, bins=10):
+        self.champion_name = champion_name
+        self.challenger_dir = challenger_dir
+        self.max_pending_rows = max_pending_rows
+        self.threshold = threshold
+        self.bins = bins
+        self.challengers = None
+        self.stats = {}
+        self.pending = 0
+        self.pending_rows = 0
+        self.dropped = 0
+        self.dropped_rows = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='shadow')
+
+    def challenger_files(self):
+        return sorted(glob.glob(os.path.join(self.challenger_dir, '*.pkl')))
+
+    def has_challengers(self):
+        """
+        Whether there is anything to shadow-score, without loading the models
+        """
+        if self.challengers is not None:
+            return bool(self.challengers)
+        return bool(self.challenger_files())
+
+    def _load_challengers(self, feature_names):
+        with self._load_lock:
+            if self.challengers is not None:
+                return self.challengers
+
+            import joblib
+
+            challengers = {}
+            for path in self.challenger_files():
+                name = os.path.splitext(os.path.basename(path))[0]
+                try:
+                    challenger = joblib.load(path)
+                    expected = getattr(challenger, 'feature_names_in_', None)
+                    if expected is not None and list(expected) != list(feature_names):
+                        raise ValueError('feature names do not match the champion')
+                    challengers[name] = challenger
+                    logger.info(f"Loaded challenger model '{name}'")
+                except Exception as e:
+                    logger.error(f"Skipping challenger '{name}': {str(e)}")
+
+            with self._lock:
+                for name in challengers:
+                    self.stats.setdefault(name, ChallengerStats(self.bins, self.threshold))
+            self.challengers = challengers
+            return challengers
+
+    def submit(self, features, champion_probabilities):
+        """
+        Queue a batch for shadow scoring without waiting for it
+        """
+        if self.challengers is not None and not self.challengers:
+            return False
+
+        import numpy as np
+
+        rows = len(features)
+        with self._lock:
+            take = min(rows, self.max_pending_rows - self.pending_rows)
+            self.dropped_rows += rows - max(take, 0)
+            if take <= 0:
+                self.dropped += 1
+                return False
+            self.pending += 1
+            self.pending_rows += take
+
+        # Keep only a float matrix of the queued rows, not the caller's frame
+        matrix = features.iloc[:take].to_numpy(dtype=float, copy=True)
+        champion = np.array(champion_probabilities[:take], dtype=float)
+        self._executor.submit(self._score, list(features.columns), matrix, champion)
+        return True
+
+    def _score(self, columns, matrix, champion):
+        import numpy as np
+        import pandas as pd
+
+        features = pd.DataFrame(matrix, columns=columns)
+        try:
+            for name, challenger in self._load_challengers(columns).items():
+                start = time.perf_counter()
+                try:
+                    probabilities = challenger.predict_proba(features)[:, 1]
+                except Exception as e:
+                    logger.error(f"Challenger '{name}' scoring error: {str(e)}")
+                    with self._lock:
+                        self.stats[name].errors += 1
+                    continue
+                elapsed = time.perf_counter() - start
+
+                with self._lock:
+                    self.stats[name].update(champion, np.asarray(probabilities, dtype=float), elapsed)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.pending_rows -= len(matrix)
+
+    def summary(self):
+        """
+        Agreement and score-distribution statistics for every challenger
+        """
+        with self._lock:
+            return {
+                'champion': self.champion_name,
+                'challenger_dir': self.challenger_dir,
+                'challengers_loaded': self.challengers is not None,
+                'challengers': {name: stats.as_dict() for name, stats in self.stats.items()},
+                'pending': self.pending,
+                'pending_rows': self.pending_rows,
+                'dropped': self.dropped,
+                'dropped_rows': self.dropped_rows,
+                'threshold': self.threshold,
+                'since': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started))
+            }
@@ -0,0 +1,89 @@
+"""
+Response Helpers
+Fast JSON serialization and pre-serialized, ETag-cached static responses
+"""
+
+import hashlib
+import json
+import threading
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    # numpy scalars/arrays that slipped through without a float()/int() cast
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """
+    Serialize ``payload`` to JSON bytes, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY, default=_default)
+    return json.dumps(payload, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def loads(body):
+    """
+    Parse JSON bytes, using orjson when it is installed; raises ValueError if invalid
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def json_response(payload, status=200):
+    """
+    Drop-in for ``jsonify`` on hot paths; returns a Response with JSON bytes
+    """
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+class StaticResponseCache:
+    """
+    Pre-serialized response bodies keyed by (name, version)
+
+    Each body is built and serialized once per version (e.g. once per model)
+    and served with a strong ETag, so clients revalidating with
+    ``If-None-Match`` get an empty 304.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, version, build):
+        """
+        Return (body, etag) for ``name`` at ``version``, calling ``build()`` on a miss
+        """
+        key = (name, version)
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    body = dumps(build())
+                    entry = (body, hashlib.sha1(body).hexdigest())
+                    # Drop bodies built for older versions of the same resource
+                    for stale in [k for k in self._entries if k[0] == name]:
+                        del self._entries[stale]
+                    self._entries[key] = entry
+        return entry
+
+    def respond(self, request, name, version, build):
+        """
+        Serve the cached body, answering conditional GETs with 304 Not Modified
+        """
+        body, etag = self.get(name, version, build)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
@@ -5,6 +5,7 @@ Tests all backend endpoints
 
 import requests
 import json
+import time
 
 BASE_URL = "http://localhost:5000"
 
@@ -198,6 +199,109 @@ def test_recommendations():
     
     return response.status_code == 200
 
+def test_whatif():
+    """Test what-if simulation endpoint"""
+    print("\n" + "="*80)
+    print("Testing What-If Endpoint")
+    print("="*80)
+    
+    # High churn risk customer
+    customer_data = {
+        "gender": "Female",
+        "SeniorCitizen": 1,
+        "Partner": "No",
+        "Dependents": "No",
+        "tenure": 2,
+        "PhoneService": "Yes",
+        "MultipleLines": "No",
+        "InternetService": "Fiber optic",
+        "OnlineSecurity": "No",
+        "OnlineBackup": "No",
+        "DeviceProtection": "No",
+        "TechSupport": "No",
+        "StreamingTV": "Yes",
+        "StreamingMovies": "Yes",
+        "Contract": "Month-to-month",
+        "PaperlessBilling": "Yes",
+        "PaymentMethod": "Electronic check",
+        "MonthlyCharges": 95.0,
+        "TotalCharges": 190.0
+    }
+    
+    response = requests.post(
+        f"{BASE_URL}/api/whatif",
+        json={"customer": customer_data},
+        headers={"Content-Type": "application/json"}
+    )
+    
+    print(f"Status Code: {response.status_code}")
+    print(f"What-If Results:")
+    print(json.dumps(response.json(), indent=2))
+    
+    return response.status_code == 200
+
+def test_models():
+    """Test champion/challenger summary endpoint"""
+    print("\n" + "="*80)
+    print("Testing Models Endpoint")
+    print("="*80)
+    
+    response = requests.get(f"{BASE_URL}/api/models")
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    
+    return response.status_code == 200
+
+def test_batch_job():
+    """Test asynchronous batch job endpoints"""
+    print("\n" + "="*80)
+    print("Testing Batch Job Endpoints")
+    print("="*80)
+    
+    customer_data = {
+        "gender": "Male",
+        "SeniorCitizen": 0,
+        "Partner": "Yes",
+        "Dependents": "No",
+        "tenure": 12,
+        "PhoneService": "Yes",
+        "MultipleLines": "No",
+        "InternetService": "DSL",
+        "OnlineSecurity": "Yes",
+        "OnlineBackup": "No",
+        "DeviceProtection": "No",
+        "TechSupport": "Yes",
+        "StreamingTV": "No",
+        "StreamingMovies": "No",
+        "Contract": "One year",
+        "PaperlessBilling": "No",
+        "PaymentMethod": "Bank transfer (automatic)",
+        "MonthlyCharges": 55.0,
+        "TotalCharges": 660.0
+    }
+    
+    response = requests.post(
+        f"{BASE_URL}/api/jobs",
+        json={"records": [customer_data] * 2500, "chunk_size": 1000},
+        headers={"Content-Type": "application/json"}
+    )
+    print(f"Submit Status Code: {response.status_code}")
+    if response.status_code != 202:
+        return False
+    
+    job_id = response.json()["job_id"]
+    for _ in range(60):
+        job = requests.get(f"{BASE_URL}/api/jobs/{job_id}").json()
+        print(f"Job {job_id}: {job['status']} {job['processed']}/{job['total']}")
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(1)
+    
+    response = requests.get(f"{BASE_URL}/api/jobs/{job_id}/results")
+    print(f"Results Status Code: {response.status_code}")
+    
+    return response.status_code == 200 and len(response.json()["results"]) == 2500
+
 def run_all_tests():
     """Run all API tests"""
     print("\n" + "🚀 Starting API Tests")
@@ -211,7 +315,10 @@ def run_all_tests():
         ("Features", test_features),
         ("Single Prediction", test_single_prediction),
         ("Batch Prediction", test_batch_prediction),
-        ("Recommendations", test_recommendations)
+        ("Recommendations", test_recommendations),
+        ("What-If", test_whatif),
+        ("Models", test_models),
+        ("Batch Job", test_batch_job)
     ]
     
     results = []
@@ -1,8 +1,19 @@
 """
 Automated Model Training Script
 Trains the churn prediction model and saves all artifacts
+
+The pipeline is split into named stages whose outputs are cached on disk, so
+re-running the script only recomputes stages whose inputs or parameters changed.
+
+Usage:
+    python train_model.py                    # reuse cached stages where possible
+    python train_model.py --force train      # re-run a single stage
+    python train_model.py --force all        # ignore the cache for every stage
+    python train_model.py --no-cache         # run without reading or writing the cache
+    python train_model.py --cprofile         # also dump a cProfile of the slowest stage
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import joblib
@@ -10,108 +21,30 @@ import os
 from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, 
+    accuracy_score, precision_score, recall_score,
     f1_score, roc_auc_score, classification_report
 )
 from xgboost import XGBClassifier
 from imblearn.over_sampling import SMOTE
+from pipeline import Pipeline, hash_file
+from profiling import grid_search_timings, measure_latency
 import warnings
 warnings.filterwarnings('ignore')
 
 # Paths
 DATA_PATH = '../data/telco_churn.csv'
 MODEL_DIR = './models'
+CACHE_DIR = './.cache/pipeline'
+PROFILE_REPORT = 'training_profile.json'
 
-# Create models directory if it doesn't exist
-os.makedirs(MODEL_DIR, exist_ok=True)
-
-print("="*80)
-print("Customer Churn Prediction - Model Training Pipeline")
-print("="*80)
-
-# Load data
-print("\n1. Loading data...")
-df = pd.read_csv(DATA_PATH)
-print(f"   Dataset shape: {df.shape}")
-
-# Data preprocessing
-print("\n2. Data preprocessing...")
-
-# Convert TotalCharges to numeric
-df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-df['TotalCharges'].fillna(df['MonthlyCharges'], inplace=True)
-
-# Feature engineering
-print("   Creating engineered features...")
-df['AvgMonthlyCharges'] = df['TotalCharges'] / (df['tenure'] + 1)
-df['ChargeIncrease'] = (df['MonthlyCharges'] > df['AvgMonthlyCharges']).astype(int)
-
-service_cols = ['PhoneService', 'MultipleLines', 'InternetService', 
-                'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 
-                'TechSupport', 'StreamingTV', 'StreamingMovies']
-df['TotalServices'] = (df[service_cols] == 'Yes').sum(axis=1)
-
-addon_services = ['OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport']
-df['HasAddonService'] = (df[addon_services] == 'Yes').any(axis=1).astype(int)
-
-df['HasStreamingService'] = ((df['StreamingTV'] == 'Yes') | 
-                              (df['StreamingMovies'] == 'Yes')).astype(int)
-
-df['SeniorWithPartner'] = ((df['SeniorCitizen'] == 1) & 
-                            (df['Partner'] == 'Yes')).astype(int)
-
-# Drop unnecessary columns
-df_model = df.drop(['customerID'], axis=1)
-
-# Separate features and target
-X = df_model.drop('Churn', axis=1)
-y = df_model['Churn'].map({'Yes': 1, 'No': 0})
+STAGES = ['load', 'preprocess', 'encode', 'split', 'scale', 'smote', 'train', 'compact', 'evaluate', 'save']
 
-print(f"   Features: {X.shape[1]}")
-print(f"   Samples: {X.shape[0]}")
+RANDOM_STATE = 42
+CV_FOLDS = 5
+SPLIT_PARAMS = {'test_size': 0.2, 'random_state': RANDOM_STATE}
+SMOTE_PARAMS = {'random_state': RANDOM_STATE, 'k_neighbors': 5}
 
-# Encode categorical variables
-print("\n3. Encoding categorical variables...")
-categorical_columns = X.select_dtypes(include=['object']).columns.tolist()
-numerical_columns = X.select_dtypes(include=['int64', 'float64']).columns.tolist()
-
-label_encoders = {}
-X_encoded = X.copy()
-
-for col in categorical_columns:
-    le = LabelEncoder()
-    X_encoded[col] = le.fit_transform(X[col].astype(str))
-    label_encoders[col] = le
-
-print(f"   Encoded {len(categorical_columns)} categorical columns")
-
-# Train-test split
-print("\n4. Splitting data...")
-X_train, X_test, y_train, y_test = train_test_split(
-    X_encoded, y, test_size=0.2, random_state=42, stratify=y
-)
-print(f"   Train: {X_train.shape[0]}, Test: {X_test.shape[0]}")
-
-# Feature scaling
-print("\n5. Scaling features...")
-scaler = StandardScaler()
-X_train_scaled = X_train.copy()
-X_test_scaled = X_test.copy()
-
-X_train_scaled[numerical_columns] = scaler.fit_transform(X_train[numerical_columns])
-X_test_scaled[numerical_columns] = scaler.transform(X_test[numerical_columns])
-
-# Handle class imbalance with SMOTE
-print("\n6. Applying SMOTE for class balance...")
-smote = SMOTE(random_state=42, k_neighbors=5)
-X_train_balanced, y_train_balanced = smote.fit_resample(X_train_scaled, y_train)
-print(f"   Balanced training set: {X_train_balanced.shape[0]}")
-
-# Model training with hyperparameter tuning
-print("\n7. Training XGBoost model with hyperparameter tuning...")
-print("   This may take several minutes...")
-
-xgb_params = {
+XGB_PARAM_GRID = {
     'n_estimators': [100, 200, 300],
     'max_depth': [3, 5, 7],
     'learning_rate': [0.01, 0.1, 0.3],
@@ -119,93 +52,462 @@ xgb_params = {
     'colsample_bytree': [0.8, 0.9, 1.0]
 }
 
-xgb_grid = GridSearchCV(
-    XGBClassifier(random_state=42, eval_metric='logloss'),
-    xgb_params,
-    cv=5,
-    scoring='roc_auc',
-    n_jobs=-1,
-    verbose=1
-)
-
-xgb_grid.fit(X_train_balanced, y_train_balanced)
-
-print(f"\n   Best parameters: {xgb_grid.best_params_}")
-print(f"   Best CV score: {xgb_grid.best_score_:.4f}")
-
-# Get best model
-best_model = xgb_grid.best_estimator_
-
-# Evaluate on test set
-print("\n8. Evaluating model on test set...")
-y_pred = best_model.predict(X_test_scaled)
-y_pred_proba = best_model.predict_proba(X_test_scaled)[:, 1]
-
-accuracy = accuracy_score(y_test, y_pred)
-precision = precision_score(y_test, y_pred)
-recall = recall_score(y_test, y_pred)
-f1 = f1_score(y_test, y_pred)
-roc_auc = roc_auc_score(y_test, y_pred_proba)
-
-print(f"\n   Accuracy:  {accuracy:.4f}")
-print(f"   Precision: {precision:.4f}")
-print(f"   Recall:    {recall:.4f}")
-print(f"   F1-Score:  {f1:.4f}")
-print(f"   ROC-AUC:   {roc_auc:.4f}")
-
-print("\n   Classification Report:")
-print(classification_report(y_test, y_pred, target_names=['No Churn', 'Churn']))
-
-# Save all artifacts
-print("\n9. Saving model and artifacts...")
-
-# Save model
-joblib.dump(best_model, os.path.join(MODEL_DIR, 'churn_model.pkl'))
-print("   ✓ Model saved")
-
-# Save scaler
-joblib.dump(scaler, os.path.join(MODEL_DIR, 'scaler.pkl'))
-print("   ✓ Scaler saved")
-
-# Save label encoders
-joblib.dump(label_encoders, os.path.join(MODEL_DIR, 'label_encoders.pkl'))
-print("   ✓ Label encoders saved")
-
-# Save feature names
-feature_names = X_train_balanced.columns.tolist()
-joblib.dump(feature_names, os.path.join(MODEL_DIR, 'feature_names.pkl'))
-print("   ✓ Feature names saved")
-
-# Save metadata
-metadata = {
-    'model_name': 'XGBoost (Tuned)',
-    'accuracy': float(accuracy),
-    'precision': float(precision),
-    'recall': float(recall),
-    'f1_score': float(f1),
-    'roc_auc': float(roc_auc),
-    'categorical_columns': categorical_columns,
-    'numerical_columns': numerical_columns,
-    'best_params': xgb_grid.best_params_
-}
 
-joblib.dump(metadata, os.path.join(MODEL_DIR, 'model_metadata.pkl'))
-print("   ✓ Model metadata saved")
-
-# Feature importance
-feature_importance = pd.DataFrame({
-    'feature': feature_names,
-    'importance': best_model.feature_importances_
-}).sort_values('importance', ascending=False)
-
-print("\n10. Top 10 Most Important Features:")
-print(feature_importance.head(10).to_string(index=False))
-
-print("\n" + "="*80)
-print("Model training completed successfully!")
-print("="*80)
-print(f"\nAll artifacts saved to: {MODEL_DIR}/")
-print("\nNext steps:")
-print("1. Start the backend: cd backend && python app.py")
-print("2. Start the frontend: cd frontend && npm start")
-print("3. Access the application at http://localhost:3000")
+def load_data(data_path, **_):
+    """
+    Stage 1: read the raw CSV
+    """
+    print("\n1. Loading data...")
+    df = pd.read_csv(data_path)
+    print(f"   Dataset shape: {df.shape}")
+    return {'raw': df}
+
+
+def preprocess(raw):
+    """
+    Stage 2: coerce TotalCharges and create engineered features
+    """
+    print("\n2. Data preprocessing...")
+    df = raw.copy()
+
+    # Convert TotalCharges to numeric
+    df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    df['TotalCharges'] = df['TotalCharges'].fillna(df['MonthlyCharges'])
+
+    # Feature engineering
+    print("   Creating engineered features...")
+    df['AvgMonthlyCharges'] = df['TotalCharges'] / (df['tenure'] + 1)
+    df['ChargeIncrease'] = (df['MonthlyCharges'] > df['AvgMonthlyCharges']).astype(int)
+
+    service_cols = ['PhoneService', 'MultipleLines', 'InternetService',
+                    'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+                    'TechSupport', 'StreamingTV', 'StreamingMovies']
+    df['TotalServices'] = (df[service_cols] == 'Yes').sum(axis=1)
+
+    addon_services = ['OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport']
+    df['HasAddonService'] = (df[addon_services] == 'Yes').any(axis=1).astype(int)
+
+    df['HasStreamingService'] = ((df['StreamingTV'] == 'Yes') |
+                                  (df['StreamingMovies'] == 'Yes')).astype(int)
+
+    df['SeniorWithPartner'] = ((df['SeniorCitizen'] == 1) &
+                                (df['Partner'] == 'Yes')).astype(int)
+
+    # Drop unnecessary columns
+    df_model = df.drop(['customerID'], axis=1)
+
+    # Separate features and target
+    X = df_model.drop('Churn', axis=1)
+    y = df_model['Churn'].map({'Yes': 1, 'No': 0})
+
+    print(f"   Features: {X.shape[1]}")
+    print(f"   Samples: {X.shape[0]}")
+    return {'X': X, 'y': y}
+
+
+def encode(X, y):
+    """
+    Stage 3: label-encode categorical variables
+    """
+    print("\n3. Encoding categorical variables...")
+    categorical_columns = X.select_dtypes(include=['object']).columns.tolist()
+    numerical_columns = X.select_dtypes(include=['int64', 'float64']).columns.tolist()
+
+    label_encoders = {}
+    X_encoded = X.copy()
+
+    for col in categorical_columns:
+        le = LabelEncoder()
+        X_encoded[col] = le.fit_transform(X[col].astype(str))
+        label_encoders[col] = le
+
+    print(f"   Encoded {len(categorical_columns)} categorical columns")
+    return {
+        'X_encoded': X_encoded,
+        'y': y,
+        'label_encoders': label_encoders,
+        'categorical_columns': categorical_columns,
+        'numerical_columns': numerical_columns
+    }
+
+
+def split(X_encoded, y, test_size, random_state, **_):
+    """
+    Stage 4: stratified train-test split
+    """
+    print("\n4. Splitting data...")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_encoded, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    print(f"   Train: {X_train.shape[0]}, Test: {X_test.shape[0]}")
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+
+
+def scale(X_train, X_test, y_train, y_test, numerical_columns, **_):
+    """
+    Stage 5: fit the scaler on the training split and apply it to both splits
+    """
+    print("\n5. Scaling features...")
+    scaler = StandardScaler()
+    X_train_scaled = X_train.copy()
+    X_test_scaled = X_test.copy()
+
+    X_train_scaled[numerical_columns] = scaler.fit_transform(X_train[numerical_columns])
+    X_test_scaled[numerical_columns] = scaler.transform(X_test[numerical_columns])
+    return {
+        'X_train_scaled': X_train_scaled,
+        'X_test_scaled': X_test_scaled,
+        'y_train': y_train,
+        'y_test': y_test,
+        'scaler': scaler
+    }
+
+
+def balance(X_train_scaled, y_train, random_state, k_neighbors, **_):
+    """
+    Stage 6: oversample the minority class with SMOTE
+    """
+    print("\n6. Applying SMOTE for class balance...")
+    smote = SMOTE(random_state=random_state, k_neighbors=k_neighbors)
+    X_train_balanced, y_train_balanced = smote.fit_resample(X_train_scaled, y_train)
+    print(f"   Balanced training set: {X_train_balanced.shape[0]}")
+    return {'X_train_balanced': X_train_balanced, 'y_train_balanced': y_train_balanced}
+
+
+def train(X_train_balanced, y_train_balanced, param_grid, cv, random_state, **_):
+    """
+    Stage 7: grid-search XGBoost hyperparameters
+    """
+    print("\n7. Training XGBoost model with hyperparameter tuning...")
+    print("   This may take several minutes...")
+
+    xgb_grid = GridSearchCV(
+        XGBClassifier(random_state=random_state, eval_metric='logloss'),
+        param_grid,
+        cv=cv,
+        scoring='roc_auc',
+        n_jobs=-1,
+        verbose=1
+    )
+
+    xgb_grid.fit(X_train_balanced, y_train_balanced)
+
+    print(f"\n   Best parameters: {xgb_grid.best_params_}")
+    print(f"   Best CV score: {xgb_grid.best_score_:.4f}")
+    return {
+        'best_model': xgb_grid.best_estimator_,
+        'best_params': xgb_grid.best_params_,
+        'best_score': float(xgb_grid.best_score_),
+        'cv_timings': grid_search_timings(xgb_grid.cv_results_)
+    }
+
+
+def _tree_counts(n_estimators, step):
+    """
+    Candidate ensemble sizes: every ``step`` trees up to and including ``n_estimators``
+    """
+    if step <= 0:
+        raise ValueError(f"Compaction step must be positive, got {step}")
+    counts = list(range(step, n_estimators, step))
+    return counts + [n_estimators]
+
+
+def _cv_truncated_auc(params, depths, counts, X_train_scaled, y_train, cv, random_state, k_neighbors):
+    """
+    Cross-validated ROC-AUC of every (depth, tree count) candidate
+
+    Folds are taken from the pre-SMOTE training split and SMOTE is applied to
+    each fold's training part only, so validation rows are never synthetic.
+    One model is fit per fold and depth; tree counts are scored by truncating
+    it with ``iteration_range``.
+    """
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    scores = {(depth, k): [] for depth in depths for k in counts}
+    for fit_idx, val_idx in folds.split(X_train_scaled, y_train):
+        smote = SMOTE(random_state=random_state, k_neighbors=k_neighbors)
+        X_fit, y_fit = smote.fit_resample(X_train_scaled.iloc[fit_idx], y_train.iloc[fit_idx])
+        X_val, y_val = X_train_scaled.iloc[val_idx], y_train.iloc[val_idx]
+        for depth in depths:
+            model = XGBClassifier(**{**params, 'max_depth': depth},
+                                  random_state=random_state, eval_metric='logloss')
+            model.fit(X_fit, y_fit)
+            for k in counts:
+                proba = model.predict_proba(X_val, iteration_range=(0, k))[:, 1]
+                scores[(depth, k)].append(roc_auc_score(y_val, proba))
+    return {key: float(np.mean(values)) for key, values in scores.items()}
+
+
+def compact(best_model, best_params, X_train_balanced, y_train_balanced, X_train_scaled, y_train,
+            tolerance, depths, step, cv, random_state, k_neighbors, **_):
+    """
+    Stage 7b: find the cheapest ensemble within ``tolerance`` ROC-AUC of the tuned model
+
+    Candidates are the tuned model truncated to its first k trees, plus
+    optional refits at shallower ``depths``. ROC-AUC is cross-validated on the
+    training split (see ``_cv_truncated_auc``) so the test split stays unseen
+    until ``evaluate``; per-row / per-batch latency is measured on the
+    ensembles fit to the full balanced training set. The winner is the fastest
+    batch scorer among the smallest passing tree counts at each depth, refit
+    with exactly that many trees.
+    """
+    print("\n7b. Compacting model within ROC-AUC budget...")
+    n_estimators = best_model.get_booster().num_boosted_rounds()
+    tuned_depth = best_params['max_depth']
+    candidate_depths = [tuned_depth] + sorted(d for d in set(depths) if d < tuned_depth)
+    counts = _tree_counts(n_estimators, step)
+
+    print(f"   Cross-validating {len(candidate_depths)} depth(s) x {len(counts)} tree counts "
+          f"over {cv} folds...")
+    cv_auc = _cv_truncated_auc({**best_params, 'n_estimators': n_estimators}, candidate_depths, counts,
+                               X_train_scaled, y_train, cv, random_state, k_neighbors)
+    baseline_auc = cv_auc[(tuned_depth, n_estimators)]
+    floor = baseline_auc - tolerance
+    print(f"   Tuned model: {n_estimators} trees, depth {tuned_depth}, "
+          f"CV ROC-AUC {baseline_auc:.4f} (floor {floor:.4f})")
+
+    ensembles = [(tuned_depth, best_model)]
+    for depth in candidate_depths[1:]:
+        shallow = XGBClassifier(**{**best_params, 'max_depth': depth},
+                                random_state=random_state, eval_metric='logloss')
+        shallow.fit(X_train_balanced, y_train_balanced)
+        ensembles.append((depth, shallow))
+
+    candidates = []
+    selected_per_depth = []
+    for depth, ensemble in ensembles:
+        for k in counts:
+            def predict(X, ensemble=ensemble, k=k):
+                return ensemble.predict_proba(X, iteration_range=(0, k))[:, 1]
+
+            candidate = {
+                'n_estimators': k,
+                'max_depth': depth,
+                'roc_auc': cv_auc[(depth, k)],
+                **measure_latency(predict, X_train_scaled)
+            }
+            candidate['within_tolerance'] = candidate['roc_auc'] >= floor
+            candidates.append(candidate)
+            print(f"   depth {depth} x {k:>3} trees: CV ROC-AUC {candidate['roc_auc']:.4f}, "
+                  f"{candidate['per_row_ms']:.2f} ms/row, {candidate['per_batch_ms']:.1f} ms/batch")
+            if candidate['within_tolerance']:
+                selected_per_depth.append(candidate)
+                # Larger ensembles at this depth can only be slower
+                break
+
+    # The full tuned model always passes, so there is at least one option
+    selected = min(selected_per_depth, key=lambda c: c['per_batch_ms'])
+    compact_params = {**best_params, 'n_estimators': selected['n_estimators'], 'max_depth': selected['max_depth']}
+
+    if compact_params == best_params:
+        compact_model = best_model
+    else:
+        # Boosting is sequential and seeded, so a refit with k rounds reproduces the first k trees
+        compact_model = XGBClassifier(**compact_params, random_state=random_state, eval_metric='logloss')
+        compact_model.fit(X_train_balanced, y_train_balanced)
+
+    print(f"   Selected: {selected['n_estimators']} trees, depth {selected['max_depth']} "
+          f"(CV ROC-AUC {selected['roc_auc']:.4f}, {selected['per_row_ms']:.2f} ms/row)")
+    return {
+        'best_model': compact_model,
+        'best_params': compact_params,
+        'compaction': {
+            'tolerance': tolerance,
+            'baseline': {'n_estimators': n_estimators, 'max_depth': tuned_depth,
+                         'roc_auc': baseline_auc},
+            'selected': selected,
+            'candidates': candidates,
+            'evaluated_on': f'{cv}-fold CV on the training split'
+        }
+    }
+
+
+def evaluate(best_model, X_test_scaled, y_test, **_):
+    """
+    Stage 8: score the selected model on the held-out test set
+    """
+    print("\n8. Evaluating model on test set...")
+    y_pred = best_model.predict(X_test_scaled)
+    y_pred_proba = best_model.predict_proba(X_test_scaled)[:, 1]
+
+    metrics = {
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'precision': float(precision_score(y_test, y_pred)),
+        'recall': float(recall_score(y_test, y_pred)),
+        'f1_score': float(f1_score(y_test, y_pred)),
+        'roc_auc': float(roc_auc_score(y_test, y_pred_proba))
+    }
+
+    print(f"\n   Accuracy:  {metrics['accuracy']:.4f}")
+    print(f"   Precision: {metrics['precision']:.4f}")
+    print(f"   Recall:    {metrics['recall']:.4f}")
+    print(f"   F1-Score:  {metrics['f1_score']:.4f}")
+    print(f"   ROC-AUC:   {metrics['roc_auc']:.4f}")
+
+    print("\n   Classification Report:")
+    print(classification_report(y_test, y_pred, target_names=['No Churn', 'Churn']))
+    return {'metrics': metrics}
+
+
+def model_name(compaction=None):
+    """
+    Display name of the saved model, noting any compaction
+    """
+    if compaction:
+        selected, baseline = compaction['selected'], compaction['baseline']
+        if (selected['n_estimators'], selected['max_depth']) != (baseline['n_estimators'], baseline['max_depth']):
+            return (f"XGBoost (Tuned, compacted to {selected['n_estimators']} trees, "
+                    f"depth {selected['max_depth']})")
+    return 'XGBoost (Tuned)'
+
+
+def save(best_model, best_params, scaler, label_encoders, X_train_balanced,
+         categorical_columns, numerical_columns, metrics, model_dir, compaction=None, **_):
+    """
+    Stage 9: write the model and all serving artifacts
+    """
+    print("\n9. Saving model and artifacts...")
+    os.makedirs(model_dir, exist_ok=True)
+
+    # Save model
+    joblib.dump(best_model, os.path.join(model_dir, 'churn_model.pkl'))
+    print("   ✓ Model saved")
+
+    # Save scaler
+    joblib.dump(scaler, os.path.join(model_dir, 'scaler.pkl'))
+    print("   ✓ Scaler saved")
+
+    # Save label encoders
+    joblib.dump(label_encoders, os.path.join(model_dir, 'label_encoders.pkl'))
+    print("   ✓ Label encoders saved")
+
+    # Save feature names
+    feature_names = X_train_balanced.columns.tolist()
+    joblib.dump(feature_names, os.path.join(model_dir, 'feature_names.pkl'))
+    print("   ✓ Feature names saved")
+
+    # Save metadata
+    metadata = {
+        'model_name': model_name(compaction),
+        **metrics,
+        'categorical_columns': categorical_columns,
+        'numerical_columns': numerical_columns,
+        'best_params': best_params,
+        'compaction': compaction
+    }
+
+    joblib.dump(metadata, os.path.join(model_dir, 'model_metadata.pkl'))
+    print("   ✓ Model metadata saved")
+    return {'feature_names': feature_names, 'metadata': metadata}
+
+
+def prepare_data(pipeline, data_path):
+    """
+    Run the data stages, load through smote, and return their results by stage name
+
+    Shared with benchmark_models.py so every consumer trains on the same split.
+    """
+    # Keyed on the CSV's content hash rather than its path
+    loaded = pipeline.run('load', load_data,
+                          params={'data_path': data_path, 'data_sha256': hash_file(data_path)},
+                          key_ignore=('data_path',))
+    prepared = pipeline.run('preprocess', preprocess, inputs=[loaded])
+    encoded = pipeline.run('encode', encode, inputs=[prepared])
+    split_data = pipeline.run('split', split, params=SPLIT_PARAMS, inputs=[encoded])
+    scaled = pipeline.run('scale', scale, inputs=[split_data, encoded])
+    balanced = pipeline.run('smote', balance, params=SMOTE_PARAMS, inputs=[scaled])
+    return {'load': loaded, 'preprocess': prepared, 'encode': encoded, 'split': split_data,
+            'scale': scaled, 'smote': balanced}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Train the churn prediction model')
+    parser.add_argument('--data-path', default=DATA_PATH, help='Path to the Telco churn CSV')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory to write model artifacts to')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Directory for cached stage outputs')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the stage cache')
+    parser.add_argument(
+        '--force', action='append', default=[], choices=STAGES + ['all'], metavar='STAGE',
+        help=f"Re-run a stage even if it is cached (repeatable; one of: {', '.join(STAGES)}, all)"
+    )
+    parser.add_argument(
+        '--cprofile', nargs='?', const='auto', default=None, choices=STAGES + ['auto'], metavar='STAGE',
+        help='Dump a cProfile of STAGE, or of the slowest stage if no stage is given'
+    )
+    parser.add_argument('--auc-tolerance', type=float, default=0.005,
+                        help='Largest ROC-AUC drop accepted when compacting the model')
+    parser.add_argument('--compact-depths', type=int, nargs='*', default=[],
+                        help='Also try refitting at these shallower tree depths')
+    parser.add_argument('--compact-step', type=int, default=10,
+                        help='Tree-count granularity of the compaction search')
+    parser.add_argument('--no-compact', action='store_true', help='Skip the compaction stage')
+    args = parser.parse_args(argv)
+    if args.compact_step <= 0:
+        parser.error('--compact-step must be a positive number of trees')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*80)
+    print("Customer Churn Prediction - Model Training Pipeline")
+    print("="*80)
+
+    pipeline = Pipeline(cache_dir=args.cache_dir, force=args.force, enabled=not args.no_cache,
+                        cprofile=args.cprofile)
+
+    data = prepare_data(pipeline, args.data_path)
+    encoded, scaled, balanced = data['encode'], data['scale'], data['smote']
+    trained = pipeline.run('train', train,
+                           params={'param_grid': XGB_PARAM_GRID, 'cv': CV_FOLDS, 'random_state': RANDOM_STATE},
+                           inputs=[balanced])
+    final = trained
+    if not args.no_compact:
+        final = pipeline.run('compact', compact,
+                             params={'tolerance': args.auc_tolerance, 'depths': args.compact_depths,
+                                     'step': args.compact_step, 'cv': CV_FOLDS, **SMOTE_PARAMS},
+                             inputs=[trained, balanced, scaled])
+    evaluated = pipeline.run('evaluate', evaluate, inputs=[final, scaled], cache=False)
+    saved = pipeline.run('save', save, params={'model_dir': args.model_dir},
+                         inputs=[final, scaled, encoded, balanced, evaluated], cache=False)
+
+    # Feature importance
+    best_model = final['best_model']
+    feature_importance = pd.DataFrame({
+        'feature': saved['feature_names'],
+        'importance': best_model.feature_importances_
+    }).sort_values('importance', ascending=False)
+
+    print("\n10. Top 10 Most Important Features:")
+    print(feature_importance.head(10).to_string(index=False))
+
+    print("\n11. Stage profile:")
+    pipeline.print_summary()
+
+    cv_timings = dict(trained['cv_timings'])
+    cv_timings['from_cache'] = next(t['status'] for t in pipeline.timings if t['stage'] == 'train') == 'hit'
+    print(f"\n   Grid search: {cv_timings['n_fits']} fits, "
+          f"{cv_timings['total_fit_seconds']:.1f}s of fit time"
+          f"{' (cached)' if cv_timings['from_cache'] else ''}")
+    print("   Slowest candidates (mean fit time per fold):")
+    for candidate in cv_timings['candidates'][:5]:
+        print(f"   {candidate['mean_fit_time']:>8.2f}s ± {candidate['std_fit_time']:.2f}s  {candidate['params']}")
+
+    report_path = os.path.join(args.model_dir, PROFILE_REPORT)
+    report = pipeline.write_report(report_path, extra={'grid_search': cv_timings})
+    print(f"\n   ✓ Profile report saved to {report_path}")
+    if 'cprofile' in report:
+        print(f"   ✓ cProfile of '{report['cprofile']['stage']}' saved to {report['cprofile']['path']}")
+
+    print("\n" + "="*80)
+    print("Model training completed successfully!")
+    print("="*80)
+    print(f"\nAll artifacts saved to: {args.model_dir}/")
+    print("\nNext steps:")
+    print("1. Start the backend: cd backend && python app.py")
+    print("2. Start the frontend: cd frontend && npm start")
+    print("3. Access the application at http://localhost:3000")
+
+
+if __name__ == '__main__':
+    main()
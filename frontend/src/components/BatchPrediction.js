@@ -1,11 +1,30 @@
 import React, { useState } from 'react';
-import { batchPredict } from '../services/api';
+import { submitBatchJob, getBatchJob, getBatchJobResults } from '../services/api';
 import { FaUpload, FaFileExport, FaTable } from 'react-icons/fa';
 
 const BatchPrediction = () => {
   const [results, setResults] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [job, setJob] = useState(null);
+
+  // Poll the job until it finishes, then fetch its results
+  const waitForJob = async (submitted) => {
+    let current = submitted;
+    setJob(current);
+
+    while (current.status === 'queued' || current.status === 'running') {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      current = await getBatchJob(current.job_id);
+      setJob(current);
+    }
+
+    if (current.status !== 'completed') {
+      throw new Error(current.error || `Batch job ${current.status}`);
+    }
+
+    return getBatchJobResults(current.job_id);
+  };
 
   const handleFileUpload = async (e) => {
     const file = e.target.files[0];
@@ -13,6 +32,7 @@ const BatchPrediction = () => {
 
     setLoading(true);
     setError(null);
+    setJob(null);
 
     try {
       const reader = new FileReader();
@@ -41,7 +61,8 @@ const BatchPrediction = () => {
             throw new Error('Unsupported file format. Please upload CSV or JSON.');
           }
 
-          const response = await batchPredict(data);
+          const submitted = await submitBatchJob(data);
+          const response = await waitForJob(submitted);
           setResults(response);
         } catch (err) {
           setError(err.message || 'Error processing file');
@@ -164,7 +185,7 @@ const BatchPrediction = () => {
             <li>Include all required customer fields (gender, tenure, services, etc.)</li>
             <li>CSV: First row must be headers matching API field names</li>
             <li>JSON: Array of customer objects with correct field names</li>
-            <li>Maximum 1000 records per batch for optimal performance</li>
+            <li>Large files are scored in the background; progress is shown while you wait</li>
           </ul>
         </div>
       </div>
@@ -174,7 +195,9 @@ const BatchPrediction = () => {
         <div className="card" style={{ marginTop: '1.5rem', textAlign: 'center', padding: '3rem' }}>
           <span className="loading-spinner" style={{ width: '40px', height: '40px' }}></span>
           <p style={{ marginTop: '1rem', color: '#666', fontSize: '1.1rem' }}>
-            Processing batch predictions...
+            {job
+              ? `Scoring batch job: ${job.processed} / ${job.total} records (${(job.progress * 100).toFixed(0)}%)`
+              : 'Uploading batch...'}
           </p>
         </div>
       )}
@@ -90,6 +90,46 @@ export const batchPredict = async (customersData) => {
   }
 };
 
+/**
+ * Submit an asynchronous batch scoring job
+ * @param {Array} customersData - Array of customer information
+ * @returns {Object} Job status, including job_id
+ */
+export const submitBatchJob = async (customersData) => {
+  try {
+    const response = await api.post('/api/jobs', { records: customersData });
+    return response.data;
+  } catch (error) {
+    throw error;
+  }
+};
+
+/**
+ * Get status and progress of a batch scoring job
+ * @param {string} jobId - Job identifier returned by submitBatchJob
+ */
+export const getBatchJob = async (jobId) => {
+  try {
+    const response = await api.get(`/api/jobs/${jobId}`);
+    return response.data;
+  } catch (error) {
+    throw error;
+  }
+};
+
+/**
+ * Download the results of a completed batch scoring job
+ * @param {string} jobId - Job identifier returned by submitBatchJob
+ */
+export const getBatchJobResults = async (jobId) => {
+  try {
+    const response = await api.get(`/api/jobs/${jobId}/results`, { timeout: 120000 });
+    return response.data;
+  } catch (error) {
+    throw error;
+  }
+};
+
 /**
  * Get personalized recommendations
  * @param {Object} customerData - Customer information